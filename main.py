@@ -14,6 +14,7 @@ GamblerHunter V2 - 赌徒猎手系统
 import asyncio
 import signal
 import sys
+import time
 from pathlib import Path
 
 # 添加项目路径
@@ -56,6 +57,7 @@ class GamblerHunterV2:
 
         # 存储管理器（三层存储架构）
         self.storage = StorageManager(
+            tick_size=Config.DEFAULT_TICK_SIZE,
             redis_host="localhost",
             redis_port=6379,
             data_dir="data/historical",
@@ -75,7 +77,8 @@ class GamblerHunterV2:
             self.orderbook,
             self.features,
             self.execution,
-            self.kill_switch
+            self.kill_switch,
+            tick_size=Config.DEFAULT_TICK_SIZE
         )
         
         # WebSocket 流
@@ -161,23 +164,27 @@ class GamblerHunterV2:
         try:
             # 处理 OrderBook 更新
             if isinstance(data, list) and len(data) > 0:
+                # 整条消息共用一个时间戳
+                now = time.time()
+                
                 for item in data:
                     # 更新 OrderBook
                     self.orderbook.update_snapshot(item)
                     
                     # 更新热存储（同步到内存）
                     if "bids" in item and "asks" in item:
-                        for bid in item["bids"][:5]:  # 保存前5档
-                            price = float(bid[0])
-                            size = float(bid[1])
-                            orders_count = int(bid[2]) if len(bid) > 2 else 0
-                            self.storage.update_bid(price, size, orders_count)
+                        bids = item["bids"][:5]  # 保存前5档
+                        asks = item["asks"][:5]
                         
-                        for ask in item["asks"][:5]:  # 保存前5档
-                            price = float(ask[0])
-                            size = float(ask[1])
-                            orders_count = int(ask[2]) if len(ask) > 2 else 0
-                            self.storage.update_ask(price, size, orders_count)
+                        self.storage.apply_updates(
+                            [float(bid[0]) for bid in bids],
+                            [float(bid[1]) for bid in bids],
+                            [float(ask[0]) for ask in asks],
+                            [float(ask[1]) for ask in asks],
+                            [int(bid[2]) if len(bid) > 2 else 0 for bid in bids],
+                            [int(ask[2]) if len(ask) > 2 else 0 for ask in asks],
+                            now=now
+                        )
                 
                 # 运行策略
                 await self.strategies.run()
@@ -209,7 +216,8 @@ class GamblerHunterV2:
                     }
                     self.storage.add_trade(trade_data)
 
-                # 运行策略
+                # 运行策略（大额成交记录 + 深度扫描）
+                await self.strategies.on_trade(data)
                 await self.strategies.run()
         
         except Exception as e:
@@ -12,6 +12,8 @@ from dataclasses import dataclass
 from datetime import datetime
 import bisect
 
+import numpy as np
+
 from utils.logger import logger
 
 
@@ -139,7 +141,6 @@ class ProfessionalOrderBook:
                 
                 if size > 0:
                     self.bids[price] = OrderBookLevel(price, size, orders_count)
-                    bisect.insort(self.sorted_bids, -price)  # 降序排列
                 else:
                     if price in self.bids:
                         del self.bids[price]
@@ -152,11 +153,14 @@ class ProfessionalOrderBook:
                 
                 if size > 0:
                     self.asks[price] = OrderBookLevel(price, size, orders_count)
-                    bisect.insort(self.sorted_asks, price)  # 升序排列
                 else:
                     if price in self.asks:
                         del self.asks[price]
             
+            # 按最终的价格集合一次性排序（快照中重复出现的价格只保留一个）
+            self.sorted_bids[:] = sorted(-price for price in self.bids)  # 降序排列
+            self.sorted_asks[:] = sorted(self.asks)  # 升序排列
+            
             # 验证校验和
             calculated_checksum = self._calculate_checksum()
             if calculated_checksum != checksum:
@@ -321,6 +325,51 @@ class ProfessionalOrderBook:
             logger.error(f"❌ 获取卖盘失败: {e}")
             return []
     
+    def fill_bids(self, prices: np.ndarray, sizes: np.ndarray) -> int:
+        """
+        将买盘前 N 档写入预分配数组（N 为数组长度）
+        
+        Args:
+            prices: 价格输出数组
+            sizes: 数量输出数组
+        
+        Returns:
+            写入的档位数
+        """
+        bids = self.bids
+        n = 0
+        
+        for key in self.sorted_bids[:len(prices)]:
+            price = -key  # sorted_bids 存的是负价格
+            if price in bids:
+                prices[n] = price
+                sizes[n] = bids[price].size
+                n += 1
+        
+        return n
+    
+    def fill_asks(self, prices: np.ndarray, sizes: np.ndarray) -> int:
+        """
+        将卖盘前 N 档写入预分配数组（N 为数组长度）
+        
+        Args:
+            prices: 价格输出数组
+            sizes: 数量输出数组
+        
+        Returns:
+            写入的档位数
+        """
+        asks = self.asks
+        n = 0
+        
+        for price in self.sorted_asks[:len(prices)]:
+            if price in asks:
+                prices[n] = price
+                sizes[n] = asks[price].size
+                n += 1
+        
+        return n
+    
     def get_best_bid(self) -> Tuple[float, float]:
         """获取买一"""
         if self.sorted_bids:
@@ -8,8 +8,14 @@
 - 用于回测和策略优化
 """
 
+import inspect
+import os
+import queue
+import shutil
+import threading
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 
@@ -17,8 +23,11 @@ try:
     import pyarrow as pa
     import pyarrow.parquet as pq
     PARQUET_AVAILABLE = True
+    # Bloom filter 写入需要较新的 pyarrow
+    BLOOM_FILTER_AVAILABLE = "bloom_filter_options" in inspect.signature(pq.ParquetWriter.__init__).parameters
 except ImportError:
     PARQUET_AVAILABLE = False
+    BLOOM_FILTER_AVAILABLE = False
 
 try:
     import h5py
@@ -26,9 +35,264 @@ try:
 except ImportError:
     HDF5_AVAILABLE = False
 
+if PARQUET_AVAILABLE:
+    # 各数据类型的固定 schema：写入时跳过 pandas -> Arrow 的类型推断，
+    # 并保证字典列在各 row group 间编码一致
+    ORDERBOOK_SCHEMA = pa.schema([
+        ("timestamp", pa.timestamp("ns")),
+        ("side", pa.dictionary(pa.int8(), pa.string())),
+        ("price", pa.float64()),
+        ("size", pa.float64()),
+        ("inst_id", pa.dictionary(pa.int32(), pa.string())),
+    ])
+    TRADES_SCHEMA = pa.schema([
+        ("price", pa.float64()),
+        ("size", pa.float64()),
+        ("side", pa.dictionary(pa.int8(), pa.string())),
+        ("timestamp", pa.timestamp("ns")),
+        ("trade_id", pa.string()),
+    ])
+    OHLCV_SCHEMA = pa.schema([
+        ("timestamp", pa.timestamp("ns")),
+        ("open", pa.float64()),
+        ("high", pa.float64()),
+        ("low", pa.float64()),
+        ("close", pa.float64()),
+        ("volume", pa.float64()),
+    ])
+else:
+    ORDERBOOK_SCHEMA = TRADES_SCHEMA = OHLCV_SCHEMA = None
+
+try:
+    import hdf5plugin
+    BLOSC_AVAILABLE = True
+except ImportError:
+    BLOSC_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import lz4.frame
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+# LZ4 frame 魔数：用于识别批量快照块是否经过压缩
+LZ4_FRAME_MAGIC = b"\x04\x22\x4d\x18"
+
+# 成交结构化数组：时间戳（纳秒）、价格、数量、方向（1 买 / -1 卖 / 0 未知）、成交 ID
+TRADE_DTYPE = np.dtype([
+    ("ts", "i8"),
+    ("px", "f8"),
+    ("sz", "f8"),
+    ("side", "i1"),
+    ("trade_id", "U32"),
+])
+
+# 方向编码 -> 名称（按 side % 3 取下标：0 -> "", 1 -> buy, -1 -> sell）
+_SIDE_NAMES = np.array(["", "buy", "sell"], dtype=object)
+
+# 后台写线程队列容量（满时 submit 阻塞，形成背压）
+WRITE_QUEUE_SIZE = 256
+
+# 后台写线程停止标记
+_STOP = object()
+
+# HDF5 分块行数：约 10 秒的盘口更新量，与常见时间范围查询的读取块对齐
+HDF5_CHUNK_ROWS = 4096
+
+# HDF5 去重只比对末尾的行数：重复提交只来自最近的数据（重发的成交、更新中的 K 线）
+HDF5_DEDUPE_TAIL_ROWS = 16 * HDF5_CHUNK_ROWS
+
+# Parquet 分片目录：每次写入生成一个分片，日切换或关闭时合并为日文件
+PARTS_DIR = "parts"
+
+# 分片 / 日文件的 schema 元数据：记录去重和排序方式，读取与合并时按此处理
+_META_DEDUPE_KEY = b"okx_auto.dedupe_key"
+_META_SORT_BY = b"okx_auto.sort_by"
+_META_BLOOM = b"okx_auto.bloom_columns"
+_META_COMPACTED = b"okx_auto.compacted_through"  # 日文件已包含的最大分片序号
+
 from utils.logger import logger
 
 
+def _epoch_unit(sample: float) -> str:
+    """
+    按数值量级判断 Unix 时间戳的单位
+    
+    一级存储和 trades_to_array 使用秒，OKX 原始推送使用毫秒；
+    1e11 秒约为 5138 年，1e11 毫秒约为 1973 年，各单位的合理取值互不重叠
+    
+    Args:
+        sample: 时间戳样本
+    
+    Returns:
+        pandas 时间单位 (s/ms/us/ns)
+    """
+    sample = abs(sample)
+    
+    if sample < 1e11:
+        return "s"
+    if sample < 1e14:
+        return "ms"
+    if sample < 1e17:
+        return "us"
+    return "ns"
+
+
+# 时间单位 -> 纳秒倍数
+_NS_PER_UNIT = {"s": 1e9, "ms": 1e6, "us": 1e3, "ns": 1.0}
+
+
+def _epoch_to_ns(values: np.ndarray) -> np.ndarray:
+    """
+    将数值 Unix 时间戳整列换算为纳秒（单位按首个有效值的量级判断）
+    
+    Args:
+        values: float64 时间戳数组
+    
+    Returns:
+        float64 纳秒时间戳数组
+    """
+    finite = values[np.isfinite(values)]
+    unit = _epoch_unit(finite[0]) if len(finite) else "s"
+    
+    return values * _NS_PER_UNIT[unit]
+
+
+def _file_date(file_path: Path) -> str:
+    """从日文件名 {inst_id}_{date}_{data_type} 中取出日期"""
+    return file_path.stem.rsplit("_", 2)[-2]
+
+
+def _layout_metadata(
+    dedupe_key: Optional[str],
+    sort_by: Optional[str],
+    bloom_columns: Optional[List[str]]
+) -> Dict[bytes, bytes]:
+    """将去重键 / 排序列 / Bloom filter 列编码为 schema 元数据"""
+    return {
+        _META_DEDUPE_KEY: (dedupe_key or "").encode(),
+        _META_SORT_BY: (sort_by or "").encode(),
+        _META_BLOOM: ",".join(bloom_columns or []).encode(),
+    }
+
+
+def _layout_from_schemas(schemas: List["pa.Schema"]) -> Tuple[Optional[str], Optional[str], List[str]]:
+    """
+    读取数据布局（以最新的带布局元数据的 schema 为准）
+    
+    Args:
+        schemas: 按写入顺序排列的 schema
+    
+    Returns:
+        (去重键, 排序列, Bloom filter 列)；旧文件没有元数据时全部为空
+    """
+    for schema in reversed(schemas):
+        meta = schema.metadata or {}
+        if _META_DEDUPE_KEY in meta:
+            bloom = meta.get(_META_BLOOM, b"").decode()
+            return (
+                meta[_META_DEDUPE_KEY].decode() or None,
+                meta.get(_META_SORT_BY, b"").decode() or None,
+                bloom.split(",") if bloom else [],
+            )
+    
+    return None, None, []
+
+
+def _valid_keys(keys: pd.Series) -> np.ndarray:
+    """去重键是否有效（空值和空字符串视为无键，不参与去重）"""
+    valid = keys.notna()
+    if pd.api.types.is_string_dtype(keys):
+        valid &= keys != ""
+    
+    return valid.to_numpy()
+
+
+def _duplicated_keys(keys: pd.Series) -> np.ndarray:
+    """
+    标记重复的去重键（同键保留最后一行）
+    
+    Args:
+        keys: 去重键列
+    
+    Returns:
+        布尔数组，True 表示该行被后面的同键行取代
+    """
+    return keys.duplicated(keep="last").to_numpy() & _valid_keys(keys)
+
+
+def pack_orderbook_snapshot(timestamp: datetime, bids, asks) -> bytes:
+    """
+    将一次 Order Book 快照编码为 msgpack 记录
+    
+    Args:
+        timestamp: 时间戳
+        bids: [(价格, 数量), ...] 或 shape (n, 2) 数组
+        asks: [(价格, 数量), ...] 或 shape (n, 2) 数组
+    
+    Returns:
+        msgpack 字节串（价格/数量以 float64 原始字节存放）
+    """
+    return msgpack.packb({
+        "ts": int(np.datetime64(timestamp, "ns").astype(np.int64)),
+        "bids": np.ascontiguousarray(bids, dtype=np.float64).tobytes(),
+        "asks": np.ascontiguousarray(asks, dtype=np.float64).tobytes(),
+    }, use_bin_type=True)
+
+
+def compress_snapshot_block(records: List[bytes]) -> bytes:
+    """
+    拼接多条快照记录并压缩为一个块
+    
+    Args:
+        records: pack_orderbook_snapshot 生成的记录
+    
+    Returns:
+        LZ4 frame（lz4 未安装时为未压缩的拼接结果）
+    """
+    block = b"".join(records)
+    
+    if LZ4_AVAILABLE:
+        return lz4.frame.compress(block, compression_level=1)
+    
+    return block
+
+
+def trades_to_array(trades: List[dict]) -> np.ndarray:
+    """
+    将成交字典列表一次性转换为结构化数组
+    
+    Args:
+        trades: [成交数据, ...]，timestamp 为数值 Unix 时间戳
+            （一级存储为秒，也接受毫秒/微秒/纳秒，按量级判断）
+    
+    Returns:
+        TRADE_DTYPE 结构化数组
+    """
+    n = len(trades)
+    arr = np.empty(n, dtype=TRADE_DTYPE)
+    
+    arr["ts"] = _epoch_to_ns(
+        np.fromiter((t["timestamp"] for t in trades), dtype=np.float64, count=n)
+    )
+    arr["px"] = np.fromiter((t["price"] for t in trades), dtype=np.float64, count=n)
+    arr["sz"] = np.fromiter((t["size"] for t in trades), dtype=np.float64, count=n)
+    arr["side"] = np.fromiter(
+        (1 if t["side"] == "buy" else -1 if t["side"] == "sell" else 0 for t in trades),
+        dtype=np.int8,
+        count=n
+    )
+    arr["trade_id"] = [str(t.get("trade_id", "")) for t in trades]
+    
+    return arr
+
+
 class ColdStorageLayer:
     """
     三级存储层 - 历史数据存储
@@ -66,6 +330,28 @@ class ColdStorageLayer:
             logger.warning("⚠️  HDF5 不可用，使用 Parquet")
             self.format = "parquet"
         
+        # Parquet 分片状态：{日文件: 日期}（有未合并分片的日期）、{日文件: 最近分片序号}
+        self._parts_lock = threading.RLock()
+        self._open_days: Dict[Path, str] = {}
+        self._part_seq: Dict[Path, int] = {}
+        self._latest_day = ""
+        
+        if self.format == "parquet":
+            # 上次运行留下的分片在下次日切换或关闭时合并
+            for parts_dir in (self.data_dir / PARTS_DIR).glob("*"):
+                if parts_dir.is_dir():
+                    file_path = self.data_dir / f"{parts_dir.name}.{self.format}"
+                    self._open_days[file_path] = _file_date(file_path)
+        
+        # 后台写线程：save_ohlcv 及 submit 提交的写入在此线程执行，调用方只负责入队
+        self._write_queue: queue.Queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop,
+            name="cold-storage-writer",
+            daemon=True
+        )
+        self._writer_thread.start()
+        
         logger.info(f"🧊 三级存储初始化完成 | 格式: {self.format} | 目录: {self.data_dir}")
     
     def _get_file_path(self, inst_id: str, date: str, data_type: str) -> Path:
@@ -89,8 +375,8 @@ class ColdStorageLayer:
         self,
         inst_id: str,
         timestamp: datetime,
-        bids: List[tuple],
-        asks: List[tuple]
+        bids,
+        asks
     ):
         """
         保存 Order Book 快照
@@ -98,44 +384,86 @@ class ColdStorageLayer:
         Args:
             inst_id: 产品 ID
             timestamp: 时间戳
-            bids: [(价格, 数量), ...]
-            asks: [(价格, 数量), ...]
+            bids: [(价格, 数量), ...] 或 shape (n, 2) 数组
+            asks: [(价格, 数量), ...] 或 shape (n, 2) 数组
         """
         try:
             date_str = timestamp.strftime("%Y-%m-%d")
             file_path = self._get_file_path(inst_id, date_str, "orderbook")
             
-            # 构造 DataFrame
-            data = []
-            
-            # 买盘
-            for price, size in bids:
-                data.append({
-                    "timestamp": timestamp,
-                    "side": "bid",
-                    "price": price,
-                    "size": size,
-                    "inst_id": inst_id
-                })
-            
-            # 卖盘
-            for price, size in asks:
-                data.append({
-                    "timestamp": timestamp,
-                    "side": "ask",
-                    "price": price,
-                    "size": size,
-                    "inst_id": inst_id
-                })
-            
-            df = pd.DataFrame(data)
+            columns = self._orderbook_columns(inst_id, [(timestamp, bids, asks)])
             
             # 保存
-            self._save_dataframe(df, file_path)
+            self._save_columns(columns, file_path, ORDERBOOK_SCHEMA)
         
         except Exception as e:
             logger.error(f"❌ 保存 Order Book 快照失败: {e}")
     
+    def save_orderbook_snapshot_batch(self, inst_id: str, block: bytes):
+        """
+        批量保存 Order Book 快照（每个日期一次写入）
+        
+        Args:
+            inst_id: 产品 ID
+            block: compress_snapshot_block 生成的快照块
+        """
+        try:
+            if block[:4] == LZ4_FRAME_MAGIC:
+                block = lz4.frame.decompress(block)
+            
+            unpacker = msgpack.Unpacker(raw=False)
+            unpacker.feed(block)
+            
+            # 按日期分组
+            groups: Dict[str, list] = {}
+            for record in unpacker:
+                timestamp = pd.Timestamp(record["ts"], unit="ns").to_pydatetime()
+                bids = np.frombuffer(record["bids"], dtype=np.float64)
+                asks = np.frombuffer(record["asks"], dtype=np.float64)
+                groups.setdefault(timestamp.strftime("%Y-%m-%d"), []).append((timestamp, bids, asks))
+            
+            for date_str, snapshots in groups.items():
+                file_path = self._get_file_path(inst_id, date_str, "orderbook")
+                columns = self._orderbook_columns(inst_id, snapshots)
+                self._save_columns(columns, file_path, ORDERBOOK_SCHEMA)
+            
+            logger.debug(f"💾 批量保存 Order Book 快照: {inst_id} | {sum(map(len, groups.values()))} 个")
+        
+        except Exception as e:
+            logger.error(f"❌ 批量保存 Order Book 快照失败: {e}")
+    
+    def _orderbook_columns(self, inst_id: str, snapshots: List[tuple]) -> dict:
+        """
+        将多个快照展开为按列存放的行
+        
+        Args:
+            inst_id: 产品 ID
+            snapshots: [(时间戳, bids, asks), ...]
+        
+        Returns:
+            {列名: 值}
+        """
+        timestamps, sides, prices, sizes = [], [], [], []
+        
+        for timestamp, bids, asks in snapshots:
+            bids = np.asarray(bids, dtype=np.float64).reshape(-1, 2)
+            asks = np.asarray(asks, dtype=np.float64).reshape(-1, 2)
+            
+            n_bids = len(bids)
+            n_asks = len(asks)
+            timestamps += [timestamp] * (n_bids + n_asks)
+            sides += ["bid"] * n_bids + ["ask"] * n_asks
+            prices += (bids[:, 0], asks[:, 0])
+            sizes += (bids[:, 1], asks[:, 1])
+        
+        return {
+            "timestamp": timestamps,
+            "side": sides,
+            "price": np.concatenate(prices),
+            "size": np.concatenate(sizes),
+            "inst_id": [inst_id] * len(timestamps),
+        }
+    
     def load_orderbook_snapshot(
         self,
         inst_id: str,
@@ -156,9 +484,12 @@ class ColdStorageLayer:
             DataFrame
         """
         try:
+            # 先落盘后台队列中的数据
+            self.flush()
+            
             file_path = self._get_file_path(inst_id, date, "orderbook")
             
-            if not file_path.exists():
+            if not self._day_exists(file_path):
                 logger.warning(f"⚠️  文件不存在: {file_path}")
                 return pd.DataFrame()
             
@@ -186,53 +517,126 @@ class ColdStorageLayer:
     def save_trades(
         self,
         inst_id: str,
-        trades: List[dict]
+        trades
     ):
         """
         保存成交数据
         
         Args:
             inst_id: 产品 ID
-            trades: [成交数据, ...]
+            trades: [成交数据, ...] 或 TRADE_DTYPE 结构化数组
                 每个成交数据包含: price, size, side, timestamp, trade_id
+                （timestamp 为数值 Unix 时间戳或可解析的时间字符串）
         """
         try:
-            if not trades:
+            if len(trades) == 0:
                 return
             
-            # 按日期分组
+            if isinstance(trades, np.ndarray):
+                self._save_trade_array(inst_id, trades)
+                return
+            
+            # 整列解析时间戳，再按日期分组（保存下标）
+            timestamps = self._normalize_timestamps(
+                [trade.get("timestamp") for trade in trades]
+            )
+            date_keys = timestamps.strftime("%Y-%m-%d")
+            
             trades_by_date = {}
             
-            for trade in trades:
-                timestamp = trade.get("timestamp")
-                if isinstance(timestamp, str):
-                    timestamp = pd.to_datetime(timestamp)
-                elif isinstance(timestamp, (int, float)):
-                    # Unix 时间戳转换为 datetime
-                    timestamp = pd.to_datetime(timestamp, unit='ms')
-                
-                if timestamp is None:
-                    continue
-                
-                date_str = timestamp.strftime("%Y-%m-%d")
+            for i in np.flatnonzero(~timestamps.isna()):
+                date_str = date_keys[i]
                 
                 if date_str not in trades_by_date:
                     trades_by_date[date_str] = []
                 
-                trades_by_date[date_str].append(trade)
+                trades_by_date[date_str].append(i)
             
             # 保存每个日期的数据
-            for date_str, daily_trades in trades_by_date.items():
-                df = pd.DataFrame(daily_trades)
+            for date_str, positions in trades_by_date.items():
+                daily_trades = [trades[i] for i in positions]
+                keys = list(dict.fromkeys(k for trade in daily_trades for k in trade))
+                columns = {
+                    key: [trade.get(key) for trade in daily_trades]
+                    for key in keys
+                }
+                # 时间戳统一存为解析后的 datetime
+                columns["timestamp"] = timestamps[positions]
+                
                 file_path = self._get_file_path(inst_id, date_str, "trades")
                 
-                self._save_dataframe(df, file_path)
+                # 按时间排序 + trade_id Bloom filter：时间范围和成交 ID 查询可跳过 row group
+                self._save_columns(
+                    columns,
+                    file_path,
+                    TRADES_SCHEMA,
+                    sort_by="timestamp",
+                    bloom_columns=["trade_id"],
+                    dedupe_key="trade_id"
+                )
             
             logger.info(f"💾 保存成交数据: {inst_id} | {len(trades)} 笔")
         
         except Exception as e:
             logger.error(f"❌ 保存成交数据失败: {e}")
     
+    def _save_trade_array(self, inst_id: str, trades: np.ndarray):
+        """
+        保存结构化成交数组（按日期切片，整列写入，不逐行处理）
+        
+        Args:
+            inst_id: 产品 ID
+            trades: TRADE_DTYPE 结构化数组
+        """
+        timestamps = trades["ts"].astype("datetime64[ns]")
+        days = timestamps.astype("datetime64[D]")
+        
+        for day in np.unique(days):
+            mask = days == day
+            daily = trades[mask]
+            
+            columns = {
+                "price": daily["px"],
+                "size": daily["sz"],
+                "side": _SIDE_NAMES[daily["side"] % 3],
+                "timestamp": timestamps[mask],
+                "trade_id": daily["trade_id"],
+            }
+            
+            file_path = self._get_file_path(inst_id, str(day), "trades")
+            self._save_columns(
+                columns,
+                file_path,
+                TRADES_SCHEMA,
+                sort_by="timestamp",
+                bloom_columns=["trade_id"],
+                dedupe_key="trade_id"
+            )
+        
+        logger.info(f"💾 保存成交数据: {inst_id} | {len(trades)} 笔")
+    
+    def _normalize_timestamps(self, raw: list) -> pd.DatetimeIndex:
+        """
+        批量解析时间戳
+        
+        按首个非空值判断类型后整列转换：数值为 Unix 时间戳（秒/毫秒/微秒/纳秒按量级判断），
+        其余按字符串解析
+        
+        Args:
+            raw: 原始时间戳列表（可含 None）
+        
+        Returns:
+            DatetimeIndex（无法解析的为 NaT）
+        """
+        sample = next((t for t in raw if t is not None), None)
+        
+        if isinstance(sample, (int, float)):
+            return pd.DatetimeIndex(
+                pd.to_datetime(np.asarray(raw, dtype=np.float64), unit=_epoch_unit(sample))
+            )
+        
+        return pd.DatetimeIndex(pd.to_datetime(raw))
+    
     def load_trades(
         self,
         inst_id: str,
@@ -251,25 +655,10 @@ class ColdStorageLayer:
             DataFrame
         """
         try:
-            all_data = []
+            # 先落盘后台队列中的数据
+            self.flush()
             
-            current_date = pd.to_datetime(start_date)
-            end_datetime = pd.to_datetime(end_date)
-            
-            while current_date <= end_datetime:
-                date_str = current_date.strftime("%Y-%m-%d")
-                file_path = self._get_file_path(inst_id, date_str, "trades")
-                
-                if file_path.exists():
-                    df = self._load_dataframe(file_path)
-                    all_data.append(df)
-                
-                current_date += pd.Timedelta(days=1)
-            
-            if all_data:
-                return pd.concat(all_data, ignore_index=True)
-            else:
-                return pd.DataFrame()
+            return self._load_date_range(inst_id, start_date, end_date, "trades")
         
         except Exception as e:
             logger.error(f"❌ 加载成交数据失败: {e}")
@@ -283,7 +672,7 @@ class ColdStorageLayer:
         ohlcv_data: pd.DataFrame
     ):
         """
-        保存 OHLCV 数据
+        保存 OHLCV 数据（与当天已有数据合并，同一时间戳保留最后一次保存的值）
         
         Args:
             inst_id: 产品 ID
@@ -303,9 +692,16 @@ class ColdStorageLayer:
                 file_path = self._get_file_path(inst_id, date_str, "ohlcv")
                 
                 group = group.drop(columns=["date"])
-                self._save_dataframe(group, file_path)
+                self.submit(
+                    self._save_dataframe,
+                    group,
+                    file_path,
+                    OHLCV_SCHEMA,
+                    "timestamp",
+                    "timestamp"
+                )
             
-            logger.info(f"💾 保存 OHLCV 数据: {inst_id} | {len(ohlcv_data)} 条")
+            logger.info(f"💾 保存 OHLCV 数据（已入队）: {inst_id} | {len(ohlcv_data)} 条")
         
         except Exception as e:
             logger.error(f"❌ 保存 OHLCV 数据失败: {e}")
@@ -328,25 +724,15 @@ class ColdStorageLayer:
             DataFrame
         """
         try:
-            all_data = []
+            # 先落盘后台队列中的数据
+            self.flush()
             
-            current_date = pd.to_datetime(start_date)
-            end_datetime = pd.to_datetime(end_date)
+            df = self._load_date_range(inst_id, start_date, end_date, "ohlcv")
             
-            while current_date <= end_datetime:
-                date_str = current_date.strftime("%Y-%m-%d")
-                file_path = self._get_file_path(inst_id, date_str, "ohlcv")
-                
-                if file_path.exists():
-                    df = self._load_dataframe(file_path)
-                    all_data.append(df)
-                
-                current_date += pd.Timedelta(days=1)
+            if df.empty:
+                return df
             
-            if all_data:
-                return pd.concat(all_data, ignore_index=True).sort_values("timestamp")
-            else:
-                return pd.DataFrame()
+            return df.sort_values("timestamp")
         
         except Exception as e:
             logger.error(f"❌ 加载 OHLCV 数据失败: {e}")
@@ -354,19 +740,340 @@ class ColdStorageLayer:
     
     # ========== 底层存储操作 ==========
     
-    def _save_dataframe(self, df: pd.DataFrame, file_path: Path):
+    def _load_date_range(
+        self,
+        inst_id: str,
+        start_date: str,
+        end_date: str,
+        data_type: str
+    ) -> pd.DataFrame:
         """
-        保存 DataFrame
+        按日期范围加载并合并数据
+        
+        Parquet 模式下先收集 Arrow Table，最后一次性 concat_tables + to_pandas，
+        避免 pd.concat 对每个 block 的重复拷贝
+        
+        Args:
+            inst_id: 产品 ID
+            start_date: 开始日期 (YYYY-MM-DD)
+            end_date: 结束日期 (YYYY-MM-DD)
+            data_type: 数据类型 (orderbook/trades/ohlcv)
+        
+        Returns:
+            DataFrame
+        """
+        all_data = []
+        
+        current_date = pd.to_datetime(start_date)
+        end_datetime = pd.to_datetime(end_date)
+        
+        while current_date <= end_datetime:
+            date_str = current_date.strftime("%Y-%m-%d")
+            file_path = self._get_file_path(inst_id, date_str, data_type)
+            
+            if self._day_exists(file_path):
+                if self.format == "parquet":
+                    all_data.append(self._read_day(file_path))
+                else:
+                    all_data.append(self._load_dataframe(file_path))
+            
+            current_date += pd.Timedelta(days=1)
+        
+        if not all_data:
+            return pd.DataFrame()
+        
+        if self.format == "parquet":
+            # Arrow 拼接只追加 chunk 指针；self_destruct 在转换过程中释放 Arrow 缓冲区
+            table = pa.concat_tables(all_data, promote_options="default")
+            return table.to_pandas(self_destruct=True)
+        
+        return pd.concat(all_data, ignore_index=True)
+    
+    def _save_dataframe(
+        self,
+        df: pd.DataFrame,
+        file_path: Path,
+        schema: Optional["pa.Schema"] = None,
+        dedupe_key: Optional[str] = None,
+        sort_by: Optional[str] = None
+    ):
+        """
+        保存 DataFrame（追加到已有文件，两种格式语义一致）
         
         Args:
             df: DataFrame
             file_path: 文件路径
+            schema: 固定 schema（列名一致时使用，否则按数据推断）
+            dedupe_key: 去重键（同键保留最后写入的行）
+            sort_by: 写入前排序的列
         """
         if self.format == "parquet":
-            df.to_parquet(file_path, index=False, compression="snappy")
+            if schema is not None and set(df.columns) == set(schema.names):
+                table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+            else:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+            
+            self._append_part(table, file_path, dedupe_key=dedupe_key, sort_by=sort_by)
         else:  # hdf5
             # HDF5 模式
-            df.to_hdf(file_path, key="data", mode="a", complevel=9, complib="blosc")
+            if sort_by and sort_by in df.columns:
+                df = df.sort_values(sort_by, kind="stable")
+            
+            self._save_dataframe_hdf5(df, file_path, dedupe_key)
+    
+    def _save_columns(
+        self,
+        columns: Dict[str, list],
+        file_path: Path,
+        schema: Optional["pa.Schema"] = None,
+        sort_by: Optional[str] = None,
+        bloom_columns: Optional[List[str]] = None,
+        dedupe_key: Optional[str] = None
+    ):
+        """
+        按列保存数据（Parquet 模式下不经过 DataFrame）
+        
+        两种格式都追加到当天的数据（Parquet 写分片，HDF5 追加到数据集）；
+        指定去重键时同键保留最后写入的行
+        
+        Args:
+            columns: {列名: 值列表}
+            file_path: 文件路径
+            schema: 固定 schema（列名一致时使用，否则按数据推断）
+            sort_by: 写入前排序的列
+            bloom_columns: 需要写 Bloom filter 的列（仅 Parquet）
+            dedupe_key: 去重键
+        """
+        if self.format == "parquet":
+            if schema is not None and set(columns) == set(schema.names):
+                table = pa.Table.from_pydict(columns, schema=schema)
+            else:
+                table = pa.Table.from_pydict(columns)
+            
+            self._append_part(table, file_path, dedupe_key, sort_by, bloom_columns)
+        else:  # hdf5
+            df = pd.DataFrame(columns)
+            
+            if sort_by and sort_by in df.columns:
+                df = df.sort_values(sort_by, kind="stable")
+            
+            self._save_dataframe_hdf5(df, file_path, dedupe_key)
+    
+    def _save_table(
+        self,
+        table: "pa.Table",
+        file_path: Path,
+        sort_by: Optional[str] = None,
+        bloom_columns: Optional[List[str]] = None,
+        metadata: Optional[Dict[bytes, bytes]] = None
+    ):
+        """
+        保存 Arrow Table 到 Parquet
+        
+        始终写入列统计和 Page Index；指定排序列时在 row group 元数据中记录排序，
+        读端可据此跳过不相关的 row group / page
+        
+        Args:
+            table: Arrow Table
+            file_path: 文件路径
+            sort_by: 写入前排序的列
+            bloom_columns: 需要写 Bloom filter 的列
+            metadata: 追加的 schema 元数据
+        """
+        options = {}
+        
+        if metadata:
+            table = table.replace_schema_metadata({**(table.schema.metadata or {}), **metadata})
+        
+        if sort_by and sort_by in table.column_names:
+            table = table.sort_by([(sort_by, "ascending")])
+            options["sorting_columns"] = [
+                pq.SortingColumn(table.column_names.index(sort_by))
+            ]
+        
+        bloom_columns = [c for c in (bloom_columns or []) if c in table.column_names]
+        if bloom_columns and BLOOM_FILTER_AVAILABLE:
+            # 高基数 ID 列使用 PLAIN 编码 + Bloom filter，而不是字典编码
+            options["use_dictionary"] = [
+                c for c in table.column_names if c not in bloom_columns
+            ]
+            options["column_encoding"] = {c: "PLAIN" for c in bloom_columns}
+            options["bloom_filter_options"] = {
+                c: {"ndv": max(table.num_rows, 1), "fpp": 0.01} for c in bloom_columns
+            }
+        
+        pq.write_table(
+            table,
+            file_path,
+            compression="snappy",
+            write_statistics=True,
+            write_page_index=True,
+            **options
+        )
+    
+    def _save_dataframe_hdf5(
+        self,
+        df: pd.DataFrame,
+        file_path: Path,
+        dedupe_key: Optional[str] = None
+    ):
+        """
+        以固定分块追加写入 HDF5
+        
+        使用 h5py 创建可扩展的 chunked 数据集（HDF5_CHUNK_ROWS 行/块），
+        避免 pandas 默认分块与查询窗口不对齐导致的读放大；
+        指定去重键时，末尾 HDF5_DEDUPE_TAIL_ROWS 行内已存在的键原位覆盖，其余行追加
+        
+        Args:
+            df: DataFrame
+            file_path: 文件路径
+            dedupe_key: 去重键（同键保留最后写入的行）
+        
+        Raises:
+            ValueError: 列与已有数据集不一致
+        """
+        if df.empty:
+            return
+        
+        # 时间列转为 int64 纳秒，字符串列转为变长 UTF-8
+        datetime_cols = []
+        fields = []
+        columns = {}
+        
+        for col in df.columns:
+            series = df[col]
+            
+            if pd.api.types.is_datetime64_any_dtype(series):
+                datetime_cols.append(col)
+                columns[col] = series.dt.as_unit("ns").astype("int64").to_numpy()
+                fields.append((col, np.int64))
+            elif pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+                columns[col] = series.to_numpy()
+                fields.append((col, columns[col].dtype))
+            else:
+                columns[col] = series.fillna("").astype(str).to_numpy(dtype=object)
+                fields.append((col, h5py.string_dtype("utf-8")))
+        
+        if BLOSC_AVAILABLE:
+            compression = hdf5plugin.Blosc(cname="zstd", clevel=5, shuffle=hdf5plugin.Blosc.SHUFFLE)
+        else:
+            compression = {"compression": "gzip", "compression_opts": 4, "shuffle": True}
+        
+        with h5py.File(file_path, "a", libver="latest") as f:
+            if "data" in f and isinstance(f["data"], h5py.Dataset):
+                dset = f["data"]
+                records = self._hdf5_records(columns, dset.dtype, file_path)
+            else:
+                records = np.empty(len(df), dtype=np.dtype(fields))
+                for col, values in columns.items():
+                    records[col] = values
+                
+                if "data" in f:
+                    # 旧版 pandas 写入的 group，直接替换
+                    del f["data"]
+                
+                dset = f.create_dataset(
+                    "data",
+                    shape=(0,),
+                    maxshape=(None,),
+                    dtype=records.dtype,
+                    chunks=(HDF5_CHUNK_ROWS,),
+                    **compression
+                )
+                dset.attrs["datetime_columns"] = datetime_cols
+            
+            start = dset.shape[0]
+            
+            if dedupe_key and dedupe_key in records.dtype.names:
+                records = self._hdf5_upsert(dset, records, dedupe_key)
+            
+            if len(records):
+                dset.resize((start + len(records),))
+                dset[start:] = records
+    
+    def _hdf5_records(self, columns: Dict[str, np.ndarray], dtype: np.dtype, file_path: Path) -> np.ndarray:
+        """
+        按已有数据集的 dtype 组装记录（列顺序以已有数据集为准）
+        
+        Args:
+            columns: {列名: 值}
+            dtype: 已有数据集的复合 dtype
+            file_path: 文件路径（用于错误信息）
+        
+        Returns:
+            结构化数组
+        
+        Raises:
+            ValueError: 列名或列类型与已有数据集不一致
+        """
+        if set(columns) != set(dtype.names):
+            raise ValueError(
+                f"HDF5 列不一致: {file_path.name} | 已有 {list(dtype.names)} | 新数据 {list(columns)}"
+            )
+        
+        n = len(next(iter(columns.values())))
+        records = np.empty(n, dtype=dtype)
+        
+        for col, values in columns.items():
+            try:
+                records[col] = values
+            except (TypeError, ValueError) as e:
+                raise ValueError(
+                    f"HDF5 列类型不一致: {file_path.name} | {col}: 已有 {dtype[col]} | 新数据 {values.dtype} ({e})"
+                ) from e
+        
+        return records
+    
+    def _hdf5_upsert(self, dset, records: np.ndarray, key: str) -> np.ndarray:
+        """
+        按键原位覆盖已存在的行
+        
+        只比对数据集末尾 HDF5_DEDUPE_TAIL_ROWS 行，每次写入的开销与文件大小无关
+        
+        Args:
+            dset: HDF5 数据集
+            records: 新记录
+            key: 去重键
+        
+        Returns:
+            需要追加的记录（键不存在的行）
+        """
+        new_keys = self._hdf5_keys(records[key])
+        
+        # 批内同键只保留最后一行
+        duplicated = _duplicated_keys(new_keys)
+        if duplicated.any():
+            records = records[~duplicated]
+            new_keys = new_keys[~duplicated].reset_index(drop=True)
+        
+        if dset.shape[0] == 0:
+            return records
+        
+        tail_start = max(dset.shape[0] - HDF5_DEDUPE_TAIL_ROWS, 0)
+        existing_keys = self._hdf5_keys(dset.fields(key)[tail_start:])
+        positions = pd.Series(
+            np.arange(tail_start, dset.shape[0]),
+            index=existing_keys.to_numpy()
+        )
+        positions = positions[~positions.index.duplicated(keep="last")]
+        
+        pos = positions.reindex(new_keys.to_numpy()).to_numpy()
+        hit = ~np.isnan(pos) & _valid_keys(new_keys)
+        
+        if hit.any():
+            order = np.argsort(pos[hit])
+            dset[pos[hit][order].astype(np.int64)] = records[hit][order]
+        
+        return records[~hit]
+    
+    def _hdf5_keys(self, values: np.ndarray) -> pd.Series:
+        """HDF5 读出的键列统一为可比较的 Series（变长字符串解码为 str）"""
+        keys = pd.Series(values)
+        
+        if keys.dtype == object and len(keys) and isinstance(keys.iloc[0], bytes):
+            keys = keys.str.decode("utf-8")
+        
+        return keys
     
     def _load_dataframe(self, file_path: Path) -> pd.DataFrame:
         """
@@ -379,9 +1086,293 @@ class ColdStorageLayer:
             DataFrame
         """
         if self.format == "parquet":
-            return pd.read_parquet(file_path)
+            return self._read_day(file_path).to_pandas()
         else:  # hdf5
-            return pd.read_hdf(file_path, key="data")
+            with h5py.File(file_path, "r") as f:
+                dset = f.get("data")
+                
+                if not isinstance(dset, h5py.Dataset):
+                    # 兼容旧版 pandas/PyTables 格式
+                    return pd.read_hdf(file_path, key="data")
+                
+                records = dset[:]
+                datetime_cols = list(dset.attrs.get("datetime_columns", []))
+            
+            df = pd.DataFrame(records)
+            
+            for col in df.columns:
+                if col in datetime_cols:
+                    df[col] = pd.to_datetime(df[col], unit="ns")
+                elif df[col].dtype == object:
+                    df[col] = df[col].str.decode("utf-8")
+            
+            return df
+    
+    # ========== 后台写线程 ==========
+    
+    def submit(self, func: Callable, *args):
+        """
+        提交写入任务到后台写线程（队列满时阻塞，形成背压）
+        
+        Args:
+            func: 写入函数，在写线程中以 func(*args) 调用（如 save_trades）
+            *args: 写入函数的参数
+        """
+        self._write_queue.put((func, args))
+    
+    def _writer_loop(self):
+        """后台写线程主循环：按提交顺序执行写入任务"""
+        while True:
+            item = self._write_queue.get()
+            
+            try:
+                if item is _STOP:
+                    return
+                
+                func, args = item
+                func(*args)
+            
+            except Exception as e:
+                logger.error(f"❌ 后台写入失败: {e}")
+            
+            finally:
+                self._write_queue.task_done()
+    
+    def flush(self):
+        """
+        等待后台写入完成
+        
+        读取经写线程写入的数据前需要先调用（load_* 已自动调用）
+        """
+        if not self._writer_thread.is_alive():
+            return
+        
+        self._write_queue.join()
+    
+    def close(self):
+        """写完队列中的任务后停止后台写线程，并合并所有未合并的分片"""
+        if self._writer_thread.is_alive():
+            self._write_queue.put(_STOP)
+            self._writer_thread.join()
+            logger.info("🔌 三级存储写线程已停止")
+        
+        with self._parts_lock:
+            self._compact_days(list(self._open_days))
+    
+    # ========== Parquet 分片 ==========
+    
+    def _parts_dir(self, file_path: Path) -> Path:
+        """日文件对应的分片目录"""
+        return self.data_dir / PARTS_DIR / file_path.stem
+    
+    def _part_paths(self, file_path: Path) -> List[Tuple[int, Path]]:
+        """
+        列出日文件的分片
+        
+        Args:
+            file_path: 日文件路径
+        
+        Returns:
+            [(序号, 分片路径), ...]，按序号升序
+        """
+        parts_dir = self._parts_dir(file_path)
+        if not parts_dir.is_dir():
+            return []
+        
+        return sorted(
+            (int(path.stem), path)
+            for path in parts_dir.glob("*.parquet")
+            if path.stem.isdigit()
+        )
+    
+    def _day_exists(self, file_path: Path) -> bool:
+        """日文件或其分片是否存在"""
+        if file_path.exists():
+            return True
+        
+        return self.format == "parquet" and self._parts_dir(file_path).is_dir()
+    
+    def _next_part_seq(self, file_path: Path) -> int:
+        """下一个分片序号（大于已有分片和日文件已合并的序号）"""
+        seq = self._part_seq.get(file_path)
+        
+        if seq is None:
+            parts = self._part_paths(file_path)
+            seq = parts[-1][0] if parts else 0
+            
+            if file_path.exists():
+                meta = pq.read_schema(file_path).metadata or {}
+                seq = max(seq, int(meta.get(_META_COMPACTED, b"0")))
+        
+        return seq + 1
+    
+    def _append_part(
+        self,
+        table: "pa.Table",
+        file_path: Path,
+        dedupe_key: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        bloom_columns: Optional[List[str]] = None
+    ):
+        """
+        将一批数据写为一个分片
+        
+        每次只落盘本批数据，耗时与当天已有数据量无关；分片先完整写入临时文件再
+        os.replace，写入途中进程退出不会留下残缺文件。读取时日文件与分片按数据集
+        合并去重，日期切换后（或 close 时）前一天的分片合并为日文件
+        
+        Args:
+            table: 新数据
+            file_path: 日文件路径
+            dedupe_key: 去重键（同键保留最后写入的行，空值和空字符串不去重）
+            sort_by: 写入前排序的列
+            bloom_columns: 需要写 Bloom filter 的列
+        """
+        if dedupe_key and dedupe_key in table.column_names:
+            duplicated = _duplicated_keys(table.column(dedupe_key).to_pandas())
+            
+            if duplicated.any():
+                table = table.filter(pa.array(~duplicated))
+        
+        with self._parts_lock:
+            seq = self._next_part_seq(file_path)
+            parts_dir = self._parts_dir(file_path)
+            parts_dir.mkdir(parents=True, exist_ok=True)
+            
+            part_path = parts_dir / f"{seq:08d}.parquet"
+            tmp_path = part_path.with_name(part_path.name + ".tmp")
+            self._save_table(
+                table,
+                tmp_path,
+                sort_by,
+                bloom_columns,
+                _layout_metadata(dedupe_key, sort_by, bloom_columns)
+            )
+            os.replace(tmp_path, part_path)
+            
+            self._part_seq[file_path] = seq
+            
+            date = _file_date(file_path)
+            self._open_days[file_path] = date
+            
+            # 日期切换：合并更早日期的分片
+            if date > self._latest_day:
+                self._latest_day = date
+                self._compact_days([path for path, day in self._open_days.items() if day < date])
+    
+    def _read_day(self, file_path: Path, memory_map: bool = True) -> Optional["pa.Table"]:
+        """
+        读取一天的数据（日文件 + 未合并的分片）
+        
+        按写入顺序拼接后，同键保留最后写入的行，并按排序列重新排序
+        
+        Args:
+            file_path: 日文件路径
+            memory_map: 是否内存映射读取（随后要替换文件时不映射）
+        
+        Returns:
+            Arrow Table（不存在时为 None）
+        """
+        read = self._load_table if memory_map else pq.read_table
+        
+        with self._parts_lock:
+            tables = []
+            compacted = 0
+            
+            if file_path.exists():
+                day = read(file_path)
+                compacted = int((day.schema.metadata or {}).get(_META_COMPACTED, b"0"))
+                tables.append(day)
+            
+            tables += [read(path) for seq, path in self._part_paths(file_path) if seq > compacted]
+        
+        if not tables:
+            return None
+        
+        if len(tables) == 1:
+            return tables[0]
+        
+        dedupe_key, sort_by, _ = _layout_from_schemas([t.schema for t in tables])
+        
+        # 列相同时统一为最新分片的类型（兼容旧版按数据推断类型写入的日文件）
+        schema = tables[-1].schema
+        tables = [
+            t.select(schema.names).cast(schema)
+            if set(t.column_names) == set(schema.names) else t
+            for t in tables
+        ]
+        table = pa.concat_tables(tables, promote_options="default")
+        
+        if dedupe_key and dedupe_key in table.column_names:
+            duplicated = _duplicated_keys(table.column(dedupe_key).to_pandas())
+            
+            if duplicated.any():
+                table = table.filter(pa.array(~duplicated))
+        
+        if sort_by and sort_by in table.column_names:
+            table = table.sort_by([(sort_by, "ascending")])
+        
+        return table
+    
+    def _compact(self, file_path: Path):
+        """
+        将日文件与分片合并为新的日文件（调用方持有 _parts_lock）
+        
+        合并结果先写临时文件再 os.replace，并在元数据中记录已合并的最大分片序号；
+        替换后、删除分片前进程退出时，读取会跳过已合并的分片
+        
+        Args:
+            file_path: 日文件路径
+        """
+        parts = self._part_paths(file_path)
+        
+        if parts:
+            table = self._read_day(file_path, memory_map=False)
+            dedupe_key, sort_by, bloom_columns = _layout_from_schemas([pq.read_schema(parts[-1][1])])
+            
+            metadata = _layout_metadata(dedupe_key, sort_by, bloom_columns)
+            metadata[_META_COMPACTED] = str(parts[-1][0]).encode()
+            
+            tmp_path = file_path.with_name(file_path.name + ".tmp")
+            self._save_table(table, tmp_path, sort_by, bloom_columns, metadata)
+            os.replace(tmp_path, file_path)
+            
+            for _, path in parts:
+                path.unlink()
+            
+            shutil.rmtree(self._parts_dir(file_path), ignore_errors=True)
+            logger.debug(f"🗜️ 合并分片: {file_path.name} | {len(parts)} 个")
+        
+        self._open_days.pop(file_path, None)
+    
+    def _compact_days(self, file_paths: List[Path]):
+        """逐个合并日文件（单个失败不影响其余）"""
+        for file_path in file_paths:
+            try:
+                self._compact(file_path)
+            except Exception as e:
+                logger.error(f"❌ 合并分片失败: {file_path} | {e}")
+    
+    def _load_table(
+        self,
+        file_path: Path,
+        columns: Optional[List[str]] = None
+    ) -> "pa.Table":
+        """
+        通过内存映射读取 Parquet
+        
+        列缓冲区直接映射自磁盘页，未压缩列零拷贝，
+        并发回测进程可共享页缓存
+        
+        Args:
+            file_path: 文件路径
+            columns: 需要读取的列（默认全部）
+        
+        Returns:
+            Arrow Table
+        """
+        with pa.memory_map(str(file_path), "r") as source:
+            return pq.read_table(source, columns=columns, use_threads=True)
     
     # ========== 数据管理 ==========
     
@@ -399,11 +1390,15 @@ class ColdStorageLayer:
         pattern = f"{inst_id}_*_{data_type}.{self.format}"
         files = list(self.data_dir.glob(pattern))
         
-        dates = []
+        # 尚未合并的分片目录（目录名即日文件名去掉扩展名）
+        if self.format == "parquet":
+            files += list((self.data_dir / PARTS_DIR).glob(f"{inst_id}_*_{data_type}"))
+        
+        dates = set()
         for file in files:
             parts = file.stem.split("_")
             if len(parts) >= 2:
-                dates.append(parts[1])
+                dates.add(parts[1])
         
         return sorted(dates)
     
@@ -419,11 +1414,17 @@ class ColdStorageLayer:
         try:
             file_path = self._get_file_path(inst_id, date, data_type)
             
-            if file_path.exists():
-                file_path.unlink()
-                logger.info(f"🗑️  删除数据: {file_path}")
-            else:
-                logger.warning(f"⚠️  文件不存在: {file_path}")
+            with self._parts_lock:
+                if not self._day_exists(file_path):
+                    logger.warning(f"⚠️  文件不存在: {file_path}")
+                    return
+                
+                file_path.unlink(missing_ok=True)
+                shutil.rmtree(self._parts_dir(file_path), ignore_errors=True)
+                self._open_days.pop(file_path, None)
+                self._part_seq.pop(file_path, None)
+            
+            logger.info(f"🗑️  删除数据: {file_path}")
         
         except Exception as e:
             logger.error(f"❌ 删除数据失败: {e}")
@@ -438,8 +1439,14 @@ class ColdStorageLayer:
         try:
             sizes = {}
             
-            for file in self.data_dir.glob(f"*.{self.format}"):
-                data_type = file.stem.split("_")[-1]
+            files = [(file, file.stem) for file in self.data_dir.glob(f"*.{self.format}")]
+            files += [
+                (file, file.parent.name)
+                for file in (self.data_dir / PARTS_DIR).glob(f"*/*.{self.format}")
+            ]
+            
+            for file, stem in files:
+                data_type = stem.split("_")[-1]
                 size = file.stat().st_size
                 
                 if data_type not in sizes:
@@ -2,20 +2,122 @@
 一级存储 (Hot Storage)
 内存中的实时镜像，延迟 < 1ms
 
-使用 Python 原生数据结构实现：
-- Order Book: dict (价格 -> 数量)，O(1) 查询和更新
+使用 NumPy 数组和 Python 原生数据结构实现：
+- Order Book: 按整数 tick 索引的 NumPy 数组，O(1) 查询和更新
 - 成交流: deque (固定长度)，自动弹出旧数据
 - 实时指标: OFI、买卖压力等
 """
 
 from collections import deque
-from typing import Dict, List, Optional
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import time
 
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 from utils.logger import logger
 
 
+# ========== 数值内核 ==========
+# 安装 numba 时编译为原生循环，否则退回等价的 NumPy 向量化实现
+
+# 成交方向编码
+SIDE_BUY = 1
+SIDE_SELL = -1
+
+
+def _buy_sell_volume_np(times, sizes, sides, cutoff):
+    """时间窗口内的买/卖成交量（NumPy 实现）"""
+    in_window = times >= cutoff
+    buy = sizes[in_window & (sides == SIDE_BUY)].sum()
+    sell = sizes[in_window & (sides == SIDE_SELL)].sum()
+    return float(buy), float(sell)
+
+
+def _depth_imbalance_np(bid_sizes, ask_sizes):
+    """买卖盘深度之差（两侧长度可不同，NumPy 实现）"""
+    return float(bid_sizes.sum() - ask_sizes.sum())
+
+
+def _recent_np(values, pos, n):
+    """环形缓冲中最近 n 个值，按时间顺序排列"""
+    return values[np.arange(pos - n, pos) % values.shape[0]]
+
+
+def _ofi_mean_np(values, pos, window):
+    """最近 window 个 OFI 的均值（NumPy 实现）"""
+    return float(_recent_np(values, pos, window).mean())
+
+
+def _ofi_slope_np(values, pos, n):
+    """最近 n 个 OFI 的线性回归斜率（NumPy 实现）"""
+    y = _recent_np(values, pos, n)
+    x = np.arange(n, dtype=np.float64)
+    return float((n * (x * y).sum() - x.sum() * y.sum()) / (n * (x * x).sum() - x.sum() ** 2))
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _buy_sell_volume(times, sizes, sides, cutoff):
+        """时间窗口内的买/卖成交量"""
+        buy = 0.0
+        sell = 0.0
+        for i in range(times.shape[0]):
+            if times[i] >= cutoff:
+                if sides[i] == 1:
+                    buy += sizes[i]
+                elif sides[i] == -1:
+                    sell += sizes[i]
+        return buy, sell
+    
+    @njit(cache=True, fastmath=True)
+    def _depth_imbalance(bid_sizes, ask_sizes):
+        """买卖盘深度之差（两侧长度可不同）"""
+        total = 0.0
+        for i in range(bid_sizes.shape[0]):
+            total += bid_sizes[i]
+        for i in range(ask_sizes.shape[0]):
+            total -= ask_sizes[i]
+        return total
+    
+    @njit(cache=True, fastmath=True)
+    def _ofi_mean(values, pos, window):
+        """最近 window 个 OFI 的均值"""
+        cap = values.shape[0]
+        total = 0.0
+        for i in range(window):
+            total += values[(pos - 1 - i) % cap]
+        return total / window
+    
+    @njit(cache=True, fastmath=True)
+    def _ofi_slope(values, pos, n):
+        """最近 n 个 OFI 的线性回归斜率（x 为 0..n-1）"""
+        cap = values.shape[0]
+        sum_x = 0.0
+        sum_y = 0.0
+        sum_xy = 0.0
+        sum_x2 = 0.0
+        for i in range(n):
+            y = values[(pos - n + i) % cap]
+            sum_x += i
+            sum_y += y
+            sum_xy += i * y
+            sum_x2 += i * i
+        return (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x * sum_x)
+else:
+    _buy_sell_volume = _buy_sell_volume_np
+    _depth_imbalance = _depth_imbalance_np
+    _ofi_mean = _ofi_mean_np
+    _ofi_slope = _ofi_slope_np
+
+
 class HotStorageLayer:
     """
     一级存储层 - 内存中的实时镜像
@@ -26,30 +128,67 @@ class HotStorageLayer:
     - 自动管理内存（固定长度队列）
     """
     
-    def __init__(self, max_trades: int = 1000, max_depth: int = 400):
+    def __init__(
+        self,
+        tick_size: float,
+        max_trades: int = 1000,
+        max_depth: int = 400,
+        book_ticks: int = 1 << 16
+    ):
         """
         初始化一级存储
         
         Args:
+            tick_size: 交易对的最小价格变动单位（OKX 产品信息 tickSz）
             max_trades: 最大成交笔数
-            max_depth: 最大深度层级
+            max_depth: 深度统计范围（距买一/卖一的 tick 数）
+            book_ticks: 订单簿数组覆盖的 tick 数（以首个价格为中心）
         """
-        # ========== Order Book 存储 ==========
-        # Key: 价格, Value: (数量, 订单数, 更新时间戳)
-        self.bids: Dict[float, tuple] = {}  # 买盘
-        self.asks: Dict[float, tuple] = {}  # 卖盘
+        if tick_size <= 0:
+            raise ValueError(f"tick_size 必须大于 0: {tick_size}")
         
-        # 排序后的价格列表（用于快速遍历）
-        self.sorted_bids: List[float] = []  # 降序
-        self.sorted_asks: List[float] = []  # 升序
+        # ========== Order Book 存储 ==========
+        # 价格量化为整数 tick，按 (tick - base_tick) 索引数组
+        # 数量为 0 表示该档位不存在
+        self.tick_size = tick_size
+        self.max_depth = max_depth
+        self.book_ticks = book_ticks
+        self.base_tick: Optional[int] = None
+        self._price_decimals = max(0, -Decimal(str(tick_size)).as_tuple().exponent)
+        
+        self.bid_sizes = np.zeros(book_ticks, dtype=np.float64)  # 买盘数量
+        self.ask_sizes = np.zeros(book_ticks, dtype=np.float64)  # 卖盘数量
+        self.bid_orders = np.zeros(book_ticks, dtype=np.int64)   # 买盘订单数
+        self.ask_orders = np.zeros(book_ticks, dtype=np.int64)   # 卖盘订单数
+        self.bid_times = np.zeros(book_ticks, dtype=np.float64)  # 买盘更新时间
+        self.ask_times = np.zeros(book_ticks, dtype=np.float64)  # 卖盘更新时间
+        
+        # 增量维护的买一/卖一索引（-1 表示空）
+        self.best_bid_idx: int = -1
+        self.best_ask_idx: int = -1
+        
+        # 窗口外被丢弃的档位数（异常价格不移动窗口）
+        self.rejected_levels: int = 0
         
         # ========== 成交流存储 ==========
         # 固定长度双端队列，自动弹出旧数据
         self.trades: deque = deque(maxlen=max_trades)
         
+        # 成交环形缓冲（供数值内核使用），未写入的槽位时间为 0
+        self.max_trades = max_trades
+        self.trade_times = np.zeros(max_trades, dtype=np.float64)
+        self.trade_sizes = np.zeros(max_trades, dtype=np.float64)
+        self.trade_sides = np.zeros(max_trades, dtype=np.int8)
+        self._trade_pos: int = 0
+        
+        # 累计写入的成交笔数（单调递增，reset 不清零），冷存储同步据此只取新增成交
+        self.total_trades: int = 0
+        
         # ========== 实时指标 ==========
-        # OFI (Order Flow Imbalance) 历史
-        self.ofi_history: deque = deque(maxlen=100)
+        # OFI (Order Flow Imbalance) 历史：环形缓冲（最近 100 个）
+        self.ofi_history = np.zeros(100, dtype=np.float64)
+        self._ofi_pos: int = 0
+        self._ofi_count: int = 0
         
         # 买卖压力
         self.buy_pressure: float = 0.0
@@ -59,11 +198,142 @@ class HotStorageLayer:
         self.update_count: int = 0
         self.last_update_time: Optional[float] = None
         
-        logger.info(f"🔥 一级存储初始化完成 | 成交流: {max_trades} | 深度: {max_depth}")
+        logger.info(f"🔥 一级存储初始化完成 | 成交流: {max_trades} | 深度: {max_depth} | tick: {tick_size}")
+    
+    # ========== Tick 索引 ==========
+    
+    def _to_tick(self, price: float) -> int:
+        """价格量化为整数 tick"""
+        return int(round(price / self.tick_size))
+    
+    def _to_price(self, idx):
+        """数组索引（标量或数组）转换回价格"""
+        return np.round((self.base_tick + idx) * self.tick_size, self._price_decimals)
+    
+    def _is_empty(self) -> bool:
+        """订单簿两侧是否都为空"""
+        return self.best_bid_idx < 0 and self.best_ask_idx < 0
+    
+    def _index_for_update(self, price: float) -> int:
+        """
+        获取价格对应的数组索引
+        
+        订单簿为空时以该价格为中心定位窗口；否则窗口外的价格被拒绝
+        （单个异常价格不会平移窗口、丢弃整个订单簿）
+        
+        Args:
+            price: 价格
+        
+        Returns:
+            数组索引，被拒绝时返回 -1
+        """
+        tick = self._to_tick(price)
+        
+        if self.base_tick is None or self._is_empty():
+            self.base_tick = tick - self.book_ticks // 2
+        
+        idx = tick - self.base_tick
+        if idx < 0 or idx >= self.book_ticks:
+            self.rejected_levels += 1
+            return -1
+        
+        return idx
+    
+    def _index_for_lookup(self, price: float) -> int:
+        """
+        获取价格对应的数组索引（不移动窗口）
+        
+        Returns:
+            数组索引，超出范围时返回 -1
+        """
+        if self.base_tick is None:
+            return -1
+        
+        idx = self._to_tick(price) - self.base_tick
+        if idx < 0 or idx >= self.book_ticks:
+            return -1
+        
+        return idx
+    
+    def _maybe_recenter(self):
+        """
+        中间价漂移到窗口边缘附近时，以中间价为中心平移窗口
+        
+        只由订单簿自身的买一/卖一触发，远离中间价的档位随之丢弃
+        """
+        bid, ask = self.best_bid_idx, self.best_ask_idx
+        if bid < 0 or ask < 0:
+            return
+        
+        margin = self.book_ticks // 8
+        if min(bid, ask) < margin or max(bid, ask) >= self.book_ticks - margin:
+            self._rebase(self.base_tick + (bid + ask) // 2)
+    
+    def _rebase(self, tick: int):
+        """
+        以 tick 为中心平移数组窗口，窗口外的档位被丢弃
+        
+        Args:
+            tick: 新的中心 tick
+        """
+        new_base = tick - self.book_ticks // 2
+        shift = new_base - self.base_tick
+        if shift == 0:
+            return
+        
+        for arr in (
+            self.bid_sizes, self.ask_sizes,
+            self.bid_orders, self.ask_orders,
+            self.bid_times, self.ask_times
+        ):
+            if abs(shift) >= self.book_ticks:
+                arr[:] = 0
+            elif shift > 0:
+                arr[:-shift] = arr[shift:]
+                arr[-shift:] = 0
+            else:
+                arr[-shift:] = arr[:shift]
+                arr[:-shift] = 0
+        
+        self.base_tick = new_base
+        self.best_bid_idx = self._scan_best_bid(self.book_ticks)
+        self.best_ask_idx = self._scan_best_ask(-1)
+        
+        logger.debug(f"🔥 订单簿窗口平移 {shift} tick")
+    
+    def _scan_best_bid(self, below: int) -> int:
+        """查找索引 below 以下的最高买价索引"""
+        nz = np.flatnonzero(self.bid_sizes[:below])
+        return int(nz[-1]) if nz.size else -1
+    
+    def _scan_best_ask(self, above: int) -> int:
+        """查找索引 above 以上的最低卖价索引"""
+        nz = np.flatnonzero(self.ask_sizes[above + 1:])
+        return above + 1 + int(nz[0]) if nz.size else -1
+    
+    @property
+    def sorted_bids(self) -> List[float]:
+        """买盘价格列表（降序）"""
+        if self.best_bid_idx < 0:
+            return []
+        return self._to_price(np.flatnonzero(self.bid_sizes)[::-1]).tolist()
+    
+    @property
+    def sorted_asks(self) -> List[float]:
+        """卖盘价格列表（升序）"""
+        if self.best_ask_idx < 0:
+            return []
+        return self._to_price(np.flatnonzero(self.ask_sizes)).tolist()
     
     # ========== Order Book 操作 ==========
     
-    def update_bid(self, price: float, size: float, orders_count: int = 0):
+    def update_bid(
+        self,
+        price: float,
+        size: float,
+        orders_count: int = 0,
+        now: Optional[float] = None
+    ):
         """
         更新买盘
         
@@ -71,26 +341,43 @@ class HotStorageLayer:
             price: 价格
             size: 数量
             orders_count: 订单数
+            now: 更新时间戳（由调用方按批次获取一次，默认取当前时间）
         """
-        current_time = time.time()
+        current_time = time.time() if now is None else now
         
         if size > 0:
             # 更新或插入
-            self.bids[price] = (size, orders_count, current_time)
+            idx = self._index_for_update(price)
+            if idx < 0:
+                return
+            
+            self.bid_sizes[idx] = size
+            self.bid_orders[idx] = orders_count
+            self.bid_times[idx] = current_time
             
-            # 维护排序
-            if price not in self.sorted_bids:
-                self._insert_sorted(self.sorted_bids, price, reverse=True)
+            if idx > self.best_bid_idx:
+                self.best_bid_idx = idx
+            self._maybe_recenter()
         else:
             # 删除（数量为 0）
-            if price in self.bids:
-                del self.bids[price]
-                self.sorted_bids.remove(price)
+            idx = self._index_for_lookup(price)
+            if idx >= 0 and self.bid_sizes[idx] > 0:
+                self.bid_sizes[idx] = 0.0
+                self.bid_orders[idx] = 0
+                
+                if idx == self.best_bid_idx:
+                    self.best_bid_idx = self._scan_best_bid(idx)
         
         self.update_count += 1
         self.last_update_time = current_time
     
-    def update_ask(self, price: float, size: float, orders_count: int = 0):
+    def update_ask(
+        self,
+        price: float,
+        size: float,
+        orders_count: int = 0,
+        now: Optional[float] = None
+    ):
         """
         更新卖盘
         
@@ -98,40 +385,135 @@ class HotStorageLayer:
             price: 价格
             size: 数量
             orders_count: 订单数
+            now: 更新时间戳（由调用方按批次获取一次，默认取当前时间）
         """
-        current_time = time.time()
+        current_time = time.time() if now is None else now
         
         if size > 0:
             # 更新或插入
-            self.asks[price] = (size, orders_count, current_time)
+            idx = self._index_for_update(price)
+            if idx < 0:
+                return
+            
+            self.ask_sizes[idx] = size
+            self.ask_orders[idx] = orders_count
+            self.ask_times[idx] = current_time
             
-            # 维护排序
-            if price not in self.sorted_asks:
-                self._insert_sorted(self.sorted_asks, price, reverse=False)
+            if self.best_ask_idx < 0 or idx < self.best_ask_idx:
+                self.best_ask_idx = idx
+            self._maybe_recenter()
         else:
             # 删除（数量为 0）
-            if price in self.asks:
-                del self.asks[price]
-                self.sorted_asks.remove(price)
+            idx = self._index_for_lookup(price)
+            if idx >= 0 and self.ask_sizes[idx] > 0:
+                self.ask_sizes[idx] = 0.0
+                self.ask_orders[idx] = 0
+                
+                if idx == self.best_ask_idx:
+                    self.best_ask_idx = self._scan_best_ask(idx)
         
         self.update_count += 1
         self.last_update_time = current_time
     
-    def _insert_sorted(self, lst: List[float], price: float, reverse: bool = False):
+    def apply_updates(
+        self,
+        bid_prices: np.ndarray,
+        bid_sizes: np.ndarray,
+        ask_prices: np.ndarray,
+        ask_sizes: np.ndarray,
+        bid_orders: Optional[np.ndarray] = None,
+        ask_orders: Optional[np.ndarray] = None,
+        now: Optional[float] = None
+    ):
         """
-        插入到已排序列表（优化版，使用 bisect）
+        批量更新订单簿（一条 WebSocket 消息中的全部档位）
+        
+        数量 > 0 为新增/更新，数量 == 0 为删除；每一侧只做一次向量化写入
         
         Args:
-            lst: 列表
-            price: 价格
-            reverse: 是否降序
+            bid_prices: 买盘价格数组
+            bid_sizes: 买盘数量数组
+            ask_prices: 卖盘价格数组
+            ask_sizes: 卖盘数量数组
+            bid_orders: 买盘订单数数组（可选）
+            ask_orders: 卖盘订单数数组（可选）
+            now: 更新时间戳（默认取当前时间）
+        """
+        current_time = time.time() if now is None else now
+        
+        bid_prices = np.asarray(bid_prices, dtype=np.float64)
+        bid_sizes = np.asarray(bid_sizes, dtype=np.float64)
+        ask_prices = np.asarray(ask_prices, dtype=np.float64)
+        ask_sizes = np.asarray(ask_sizes, dtype=np.float64)
+        
+        # 买盘
+        if bid_prices.size:
+            up_idx, up_pos, del_idx = self._batch_indices(bid_prices, bid_sizes)
+            
+            self.bid_sizes[up_idx] = bid_sizes[up_pos]
+            self.bid_orders[up_idx] = 0 if bid_orders is None else np.asarray(bid_orders)[up_pos]
+            self.bid_times[up_idx] = current_time
+            self.bid_sizes[del_idx] = 0.0
+            self.bid_orders[del_idx] = 0
+            
+            if up_idx.size and up_idx.max() > self.best_bid_idx:
+                self.best_bid_idx = int(up_idx.max())
+            if self.best_bid_idx >= 0 and self.bid_sizes[self.best_bid_idx] == 0:
+                self.best_bid_idx = self._scan_best_bid(self.best_bid_idx)
+        
+        # 卖盘
+        if ask_prices.size:
+            up_idx, up_pos, del_idx = self._batch_indices(ask_prices, ask_sizes)
+            
+            self.ask_sizes[up_idx] = ask_sizes[up_pos]
+            self.ask_orders[up_idx] = 0 if ask_orders is None else np.asarray(ask_orders)[up_pos]
+            self.ask_times[up_idx] = current_time
+            self.ask_sizes[del_idx] = 0.0
+            self.ask_orders[del_idx] = 0
+            
+            if up_idx.size and (self.best_ask_idx < 0 or up_idx.min() < self.best_ask_idx):
+                self.best_ask_idx = int(up_idx.min())
+            if self.best_ask_idx >= 0 and self.ask_sizes[self.best_ask_idx] == 0:
+                self.best_ask_idx = self._scan_best_ask(self.best_ask_idx)
+        
+        self._maybe_recenter()
+        
+        self.update_count += bid_prices.size + ask_prices.size
+        self.last_update_time = current_time
+    
+    def _batch_indices(self, prices: np.ndarray, sizes: np.ndarray) -> tuple:
         """
-        import bisect
-        # 对于降序列表，用负价格比较
-        bisect.insort(lst, -price if reverse else price)
-        # 如果是降序，需要转换为正数
-        if reverse:
-            lst[-1] = -lst[-1]
+        批量计算数组索引
+        
+        Args:
+            prices: 价格数组
+            sizes: 数量数组
+        
+        Returns:
+            (新增/更新索引, 新增/更新在输入中的位置, 删除索引)
+        """
+        ticks = np.rint(prices / self.tick_size).astype(np.int64)
+        upsert = sizes > 0
+        
+        if (self.base_tick is None or self._is_empty()) and upsert.any():
+            # 空订单簿：以本批新增档位的中位数定位窗口
+            self.base_tick = int(np.median(ticks[upsert])) - self.book_ticks // 2
+        
+        if self.base_tick is None:
+            return ticks[:0], ticks[:0], ticks[:0]
+        
+        idx = ticks - self.base_tick
+        in_range = (idx >= 0) & (idx < self.book_ticks)
+        
+        # 窗口外的新增档位直接丢弃（不因个别异常价格平移窗口）
+        rejected = upsert & ~in_range
+        if rejected.any():
+            self.rejected_levels += int(rejected.sum())
+        
+        up_pos = np.flatnonzero(upsert & in_range)
+        del_idx = idx[~upsert & in_range]
+        
+        return idx[up_pos], up_pos, del_idx
     
     def get_best_bid(self) -> Optional[tuple]:
         """
@@ -140,12 +522,11 @@ class HotStorageLayer:
         Returns:
             (价格, 数量) 或 None
         """
-        if not self.sorted_bids:
+        idx = self.best_bid_idx
+        if idx < 0:
             return None
         
-        price = self.sorted_bids[0]
-        size, _, _ = self.bids[price]
-        return (price, size)
+        return (float(self._to_price(idx)), float(self.bid_sizes[idx]))
     
     def get_best_ask(self) -> Optional[tuple]:
         """
@@ -154,12 +535,67 @@ class HotStorageLayer:
         Returns:
             (价格, 数量) 或 None
         """
-        if not self.sorted_asks:
+        idx = self.best_ask_idx
+        if idx < 0:
             return None
         
-        price = self.sorted_asks[0]
-        size, _, _ = self.asks[price]
-        return (price, size)
+        return (float(self._to_price(idx)), float(self.ask_sizes[idx]))
+    
+    def snapshot_top_n(self, n: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        一次性获取前 n 档快照
+        
+        Args:
+            n: 档位数
+        
+        Returns:
+            (bids, asks)，各为 shape (k, 2) 的 [价格, 数量] 数组，k <= n
+        """
+        return self.top_n_depth(n, "bid"), self.top_n_depth(n, "ask")
+    
+    def top_n_depth(self, n: int, side: str) -> np.ndarray:
+        """
+        获取单边前 n 档 [价格, 数量]
+        
+        从最优价索引向外按窗口扫描非零档位，窗口不足 n 档时扩大，
+        不遍历整个 tick 数组
+        
+        Args:
+            n: 档位数
+            side: 方向 (bid/ask)
+        
+        Returns:
+            shape (k, 2) 数组，k <= n
+        """
+        if side == "bid":
+            sizes, best = self.bid_sizes, self.best_bid_idx
+        else:
+            sizes, best = self.ask_sizes, self.best_ask_idx
+        
+        if best < 0 or n <= 0:
+            return np.empty((0, 2))
+        
+        span = max(4 * n, 64)
+        
+        while True:
+            if side == "bid":
+                lo = max(0, best + 1 - span)
+                idx = lo + np.flatnonzero(sizes[lo:best + 1])[::-1][:n]
+                exhausted = lo == 0
+            else:
+                hi = min(sizes.shape[0], best + span)
+                idx = best + np.flatnonzero(sizes[best:hi])[:n]
+                exhausted = hi == sizes.shape[0]
+            
+            if idx.shape[0] >= n or exhausted:
+                break
+            
+            span *= 4
+        
+        depth = np.empty((idx.shape[0], 2))
+        depth[:, 0] = self._to_price(idx)
+        depth[:, 1] = sizes[idx]
+        return depth
     
     def get_mid_price(self) -> Optional[float]:
         """
@@ -202,10 +638,14 @@ class HotStorageLayer:
         Returns:
             深度
         """
+        idx = self._index_for_lookup(price)
+        if idx < 0:
+            return 0.0
+        
         if side == "bid":
-            return self.bids.get(price, (0, 0, 0))[0]
+            return float(self.bid_sizes[idx])
         else:
-            return self.asks.get(price, (0, 0, 0))[0]
+            return float(self.ask_sizes[idx])
     
     # ========== 成交流操作 ==========
     
@@ -224,12 +664,23 @@ class HotStorageLayer:
                 }
         """
         self.trades.append(trade)
+        self.total_trades += 1
+        
+        side = trade["side"]
+        size = trade["size"]
+        
+        # 写入环形缓冲
+        pos = self._trade_pos
+        self.trade_times[pos] = trade["timestamp"]
+        self.trade_sizes[pos] = size
+        self.trade_sides[pos] = SIDE_BUY if side == "buy" else SIDE_SELL if side == "sell" else 0
+        self._trade_pos = (pos + 1) % self.max_trades
         
         # 更新买卖压力
-        if trade["side"] == "buy":
-            self.buy_pressure += trade["size"]
+        if side == "buy":
+            self.buy_pressure += size
         else:
-            self.sell_pressure += trade["size"]
+            self.sell_pressure += size
         
         # 计算实时 OFI
         self._calculate_ofi()
@@ -271,10 +722,12 @@ class HotStorageLayer:
         Returns:
             买卖比例（买量/卖量）
         """
-        trades = self.get_trades_in_window(window_seconds)
-        
-        buy_volume = sum(t["size"] for t in trades if t["side"] == "buy")
-        sell_volume = sum(t["size"] for t in trades if t["side"] == "sell")
+        buy_volume, sell_volume = _buy_sell_volume(
+            self.trade_times,
+            self.trade_sizes,
+            self.trade_sides,
+            time.time() - window_seconds
+        )
         
         if sell_volume == 0:
             return float("inf") if buy_volume > 0 else 1.0
@@ -292,12 +745,18 @@ class HotStorageLayer:
         if best_bid and best_ask:
             mid_price = self.get_mid_price()
             
-            # 简化版 OFI（实际应该使用增量）
-            bid_depth = sum(size for size, _, _ in self.bids.values())
-            ask_depth = sum(size for size, _, _ in self.asks.values())
+            # 简化版 OFI（实际应该使用增量），只统计买一/卖一附近 max_depth 个 tick
+            bid, ask, depth = self.best_bid_idx, self.best_ask_idx, self.max_depth
+            ofi = _depth_imbalance(
+                self.bid_sizes[max(0, bid + 1 - depth):bid + 1],
+                self.ask_sizes[ask:ask + depth]
+            ) / mid_price
             
-            ofi = (bid_depth - ask_depth) / mid_price
-            self.ofi_history.append(ofi)
+            pos = self._ofi_pos
+            self.ofi_history[pos] = ofi
+            self._ofi_pos = (pos + 1) % self.ofi_history.shape[0]
+            if self._ofi_count < self.ofi_history.shape[0]:
+                self._ofi_count += 1
     
     def get_ofi(self, window: int = 10) -> float:
         """
@@ -309,10 +768,10 @@ class HotStorageLayer:
         Returns:
             OFI 值
         """
-        if len(self.ofi_history) < window:
+        if window <= 0 or self._ofi_count < window:
             return 0.0
         
-        return sum(list(self.ofi_history)[-window:]) / window
+        return float(_ofi_mean(self.ofi_history, self._ofi_pos, window))
     
     def get_ofi_trend(self) -> str:
         """
@@ -321,23 +780,11 @@ class HotStorageLayer:
         Returns:
             趋势 (rising/falling/stable)
         """
-        if len(self.ofi_history) < 10:
+        if self._ofi_count < 10:
             return "stable"
         
-        recent = list(self.ofi_history)[-10:]
-        
-        # 计算斜率
-        x = list(range(len(recent)))
-        y = recent
-        
-        # 简单线性回归
-        n = len(recent)
-        sum_x = sum(x)
-        sum_y = sum(y)
-        sum_xy = sum(xi * yi for xi, yi in zip(x, y))
-        sum_x2 = sum(xi ** 2 for xi in x)
-        
-        slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x ** 2)
+        # 最近 10 个 OFI 的简单线性回归斜率
+        slope = _ofi_slope(self.ofi_history, self._ofi_pos, 10)
         
         if slope > 0.001:
             return "rising"
@@ -354,14 +801,15 @@ class HotStorageLayer:
         best_ask = self.get_best_ask()
         
         return {
-            "bids_count": len(self.bids),
-            "asks_count": len(self.asks),
+            "bids_count": int(np.count_nonzero(self.bid_sizes)),
+            "asks_count": int(np.count_nonzero(self.ask_sizes)),
             "best_bid": best_bid[0] if best_bid else None,
             "best_ask": best_ask[0] if best_ask else None,
             "mid_price": self.get_mid_price(),
             "spread": self.get_spread(),
             "trades_count": len(self.trades),
             "update_count": self.update_count,
+            "rejected_levels": self.rejected_levels,
             "last_update": self.last_update_time,
             "buy_pressure": self.buy_pressure,
             "sell_pressure": self.sell_pressure,
@@ -371,12 +819,24 @@ class HotStorageLayer:
     
     def reset(self):
         """重置存储"""
-        self.bids.clear()
-        self.asks.clear()
-        self.sorted_bids.clear()
-        self.sorted_asks.clear()
+        for arr in (
+            self.bid_sizes, self.ask_sizes,
+            self.bid_orders, self.ask_orders,
+            self.bid_times, self.ask_times
+        ):
+            arr[:] = 0
+        self.base_tick = None
+        self.best_bid_idx = -1
+        self.best_ask_idx = -1
+        self.rejected_levels = 0
         self.trades.clear()
-        self.ofi_history.clear()
+        self.trade_times[:] = 0
+        self.trade_sizes[:] = 0
+        self.trade_sides[:] = 0
+        self._trade_pos = 0
+        self.ofi_history[:] = 0
+        self._ofi_pos = 0
+        self._ofi_count = 0
         self.buy_pressure = 0.0
         self.sell_pressure = 0.0
         self.update_count = 0
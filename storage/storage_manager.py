@@ -8,15 +8,34 @@
 - 存储路由和缓存管理
 """
 
+import threading
+import time
+from itertools import islice
 from typing import Optional, Dict, List, Any
 from datetime import datetime
 
+try:
+    from cachetools import TTLCache
+    CACHETOOLS_AVAILABLE = True
+except ImportError:
+    CACHETOOLS_AVAILABLE = False
+
 from storage.hot_storage import HotStorageLayer
 from storage.warm_storage import WarmStorageLayer
-from storage.cold_storage import ColdStorageLayer
+from storage.cold_storage import (
+    ColdStorageLayer,
+    MSGPACK_AVAILABLE,
+    pack_orderbook_snapshot,
+    compress_snapshot_block,
+    trades_to_array
+)
 from utils.logger import logger
 
 
+# 本地缓存未命中标记
+_MISSING = object()
+
+
 class StorageManager:
     """
     存储管理器 - 统一管理三层存储
@@ -29,6 +48,7 @@ class StorageManager:
     
     def __init__(
         self,
+        tick_size: float,
         redis_host: str = "localhost",
         redis_port: int = 6379,
         data_dir: str = "data/historical",
@@ -39,6 +59,7 @@ class StorageManager:
         初始化存储管理器
         
         Args:
+            tick_size: 交易对的最小价格变动单位（OKX 产品信息 tickSz）
             redis_host: Redis 主机
             redis_port: Redis 端口
             data_dir: 数据目录
@@ -46,7 +67,7 @@ class StorageManager:
             key_prefix: Redis 键前缀
         """
         # 初始化三层存储
-        self.hot = HotStorageLayer(max_trades=max_trades)
+        self.hot = HotStorageLayer(tick_size, max_trades=max_trades)
         self.warm = WarmStorageLayer(
             host=redis_host,
             port=redis_port,
@@ -57,6 +78,31 @@ class StorageManager:
         # 配置
         self.auto_save_to_cold = True
         self.cold_save_interval = 60  # 秒
+        self.sync_inst_id = "BTC-USDT-SWAP"
+        self.snapshot_batch_size = 10  # 攒满 N 个快照后压缩为一个块写入
+        
+        # 待写入的快照记录（msgpack）
+        self._snapshot_buffer: List[bytes] = []
+        
+        # 已同步到冷存储的成交笔数（对应 hot.total_trades）
+        self._synced_trades = 0
+        
+        # 温存储读缓存（余额/持仓/交易开关）：本进程写入时直接更新，
+        # 温存储被修改时（包括本进程的写入）由键空间通知使对应缓存项失效，最长 0.5 秒过期兜底
+        self._cache = TTLCache(maxsize=1024, ttl=0.5) if CACHETOOLS_AVAILABLE else None
+        self._cache_lock = threading.Lock()
+        
+        if self._cache is not None:
+            self.warm.watch_keys(
+                ["balances", "positions", "switch:*"],
+                self._on_warm_key_changed
+            )
+        
+        # 温/冷存储统计缓存 (刷新时间, 统计)：INFO/DBSIZE 和目录遍历较重，过期后后台刷新
+        self.stats_ttl = 1.0  # 秒
+        self._stats_cache: tuple = (0.0, None)
+        self._stats_lock = threading.Lock()
+        self._stats_refreshing = False
         
         # 状态
         self.running = False
@@ -68,7 +114,13 @@ class StorageManager:
     
     # ========== Order Book 操作 ==========
     
-    def update_bid(self, price: float, size: float, orders_count: int = 0):
+    def update_bid(
+        self,
+        price: float,
+        size: float,
+        orders_count: int = 0,
+        now: Optional[float] = None
+    ):
         """
         更新买盘（热存储）
         
@@ -76,10 +128,17 @@ class StorageManager:
             price: 价格
             size: 数量
             orders_count: 订单数
+            now: 更新时间戳
         """
-        self.hot.update_bid(price, size, orders_count)
+        self.hot.update_bid(price, size, orders_count, now)
     
-    def update_ask(self, price: float, size: float, orders_count: int = 0):
+    def update_ask(
+        self,
+        price: float,
+        size: float,
+        orders_count: int = 0,
+        now: Optional[float] = None
+    ):
         """
         更新卖盘（热存储）
         
@@ -87,8 +146,35 @@ class StorageManager:
             price: 价格
             size: 数量
             orders_count: 订单数
+            now: 更新时间戳
+        """
+        self.hot.update_ask(price, size, orders_count, now)
+    
+    def apply_updates(
+        self,
+        bid_prices,
+        bid_sizes,
+        ask_prices,
+        ask_sizes,
+        bid_orders=None,
+        ask_orders=None,
+        now: Optional[float] = None
+    ):
         """
-        self.hot.update_ask(price, size, orders_count)
+        批量更新订单簿（热存储）
+        
+        Args:
+            bid_prices: 买盘价格数组
+            bid_sizes: 买盘数量数组
+            ask_prices: 卖盘价格数组
+            ask_sizes: 卖盘数量数组
+            bid_orders: 买盘订单数数组
+            ask_orders: 卖盘订单数数组
+            now: 更新时间戳
+        """
+        self.hot.apply_updates(
+            bid_prices, bid_sizes, ask_prices, ask_sizes, bid_orders, ask_orders, now
+        )
     
     def get_best_bid(self) -> Optional[tuple]:
         """获取买一"""
@@ -148,26 +234,49 @@ class StorageManager:
     def set_balance(self, ccy: str, balance: float):
         """设置账户余额"""
         self.warm.set_balance(ccy, balance)
+        self._cache_put(("balance", ccy), float(balance))
     
     def get_balance(self, ccy: str) -> float:
         """获取账户余额"""
-        return self.warm.get_balance(ccy)
+        return self._cached(("balance", ccy), self.warm.get_balance, ccy)
+    
+    def get_all_balances(self) -> Dict[str, float]:
+        """获取所有币种余额"""
+        return self.warm.get_all_balances()
+    
+    def set_balances_bulk(self, balances: Dict[str, float]):
+        """批量设置账户余额"""
+        self.warm.set_balances_bulk(balances)
+        for ccy, balance in balances.items():
+            self._cache_put(("balance", ccy), float(balance))
     
     def set_position(self, inst_id: str, side: str, size: float, avg_price: float):
         """设置持仓"""
         self.warm.set_position(inst_id, side, size, avg_price)
+        self._cache_pop(("position", inst_id))
+    
+    def set_positions_bulk(self, positions: List[tuple]):
+        """批量设置持仓"""
+        self.warm.set_positions_bulk(positions)
+        for position in positions:
+            self._cache_pop(("position", position[0]))
     
     def get_position(self, inst_id: str) -> Optional[dict]:
         """获取持仓"""
-        return self.warm.get_position(inst_id)
+        return self._cached(("position", inst_id), self.warm.get_position, inst_id)
     
     def get_all_positions(self) -> Dict[str, dict]:
         """获取所有持仓"""
         return self.warm.get_all_positions()
     
+    def iter_positions(self, count: int = 1000):
+        """逐批遍历持仓"""
+        return self.warm.iter_positions(count)
+    
     def delete_position(self, inst_id: str):
         """删除持仓"""
         self.warm.delete_position(inst_id)
+        self._cache_pop(("position", inst_id))
     
     # ========== 风控参数（温存储）==========
     
@@ -183,6 +292,10 @@ class StorageManager:
         """设置当日盈亏"""
         self.warm.set_daily_pnl(value)
     
+    def add_daily_pnl(self, amount: float) -> float:
+        """累加当日盈亏"""
+        return self.warm.add_daily_pnl(amount)
+    
     def get_daily_pnl(self) -> float:
         """获取当日盈亏"""
         return self.warm.get_daily_pnl()
@@ -192,6 +305,7 @@ class StorageManager:
     def set_global_switch(self, name: str, enabled: bool):
         """设置全局开关"""
         self.warm.set_global_switch(name, enabled)
+        self._cache_pop(("switch", name))
     
     def get_global_switch(self, name: str, default: bool = False) -> bool:
         """获取全局开关"""
@@ -199,15 +313,81 @@ class StorageManager:
     
     def is_trading_allowed(self) -> bool:
         """检查是否允许交易"""
-        return self.warm.is_trading_allowed()
+        return self._cached(("switch", "trading_allowed"), self.warm.is_trading_allowed)
     
     def enable_trading(self):
         """启用交易"""
         self.warm.enable_trading()
+        self._cache_pop(("switch", "trading_allowed"))
     
     def disable_trading(self):
         """禁用交易"""
         self.warm.disable_trading()
+        self._cache_pop(("switch", "trading_allowed"))
+    
+    # ========== 本地读缓存 ==========
+    
+    def _cached(self, key: tuple, loader, *args) -> Any:
+        """
+        从本地缓存读取，未命中时回源温存储
+        
+        Args:
+            key: 缓存键
+            loader: 回源函数
+            *args: 回源参数
+        
+        Returns:
+            值
+        """
+        cache = self._cache
+        if cache is None:
+            return loader(*args)
+        
+        with self._cache_lock:
+            value = cache.get(key, _MISSING)
+        
+        if value is _MISSING:
+            value = loader(*args)
+            with self._cache_lock:
+                cache[key] = value
+        
+        return value
+    
+    def _cache_put(self, key: tuple, value: Any):
+        """写穿：更新本地缓存"""
+        if self._cache is not None:
+            with self._cache_lock:
+                self._cache[key] = value
+    
+    def _cache_pop(self, key: tuple):
+        """使单个缓存项失效"""
+        if self._cache is not None:
+            with self._cache_lock:
+                self._cache.pop(key, None)
+    
+    def _on_warm_key_changed(self, key: str):
+        """
+        键空间通知回调（订阅线程中调用）：温存储被修改时使对应缓存项失效
+        
+        哈希键的通知不含字段名，余额/持仓按整个哈希失效；本进程自身写入也会收到通知，
+        失效后下次读取回源一次，不做区分
+        
+        Args:
+            key: 被修改的键（不含前缀）
+        """
+        if key == "balances":
+            match = lambda k: k[0] == "balance"
+        elif key == "positions":
+            match = lambda k: k[0] == "position"
+        elif key.startswith("switch:"):
+            name = key[len("switch:"):]
+            match = lambda k: k == ("switch", name)
+        else:
+            return
+        
+        with self._cache_lock:
+            for cache_key in [k for k in self._cache if match(k)]:
+                self._cache.pop(cache_key, None)
     
     # ========== 历史数据（冷存储）==========
     
@@ -215,8 +395,8 @@ class StorageManager:
         self,
         inst_id: str,
         timestamp: datetime,
-        bids: List[tuple],
-        asks: List[tuple]
+        bids,
+        asks
     ):
         """保存 Order Book 快照"""
         self.cold.save_orderbook_snapshot(inst_id, timestamp, bids, asks)
@@ -232,8 +412,9 @@ class StorageManager:
         return self.cold.load_orderbook_snapshot(inst_id, date, start_time, end_time)
     
     def save_trades(self, inst_id: str, trades: List[dict]):
-        """保存成交数据"""
-        self.cold.save_trades(inst_id, trades)
+        """保存成交数据（与 sync_to_cold 相同，先转为结构化数组再写入）"""
+        if trades:
+            self.cold.save_trades(inst_id, trades_to_array(trades))
     
     def load_trades(self, inst_id: str, start_date: str, end_date: str):
         """加载成交数据"""
@@ -253,19 +434,56 @@ class StorageManager:
         """获取分布式锁"""
         return self.warm.acquire_lock(lock_name, timeout)
     
-    def release_lock(self, lock_name: str):
+    def release_lock(self, lock_name: str) -> bool:
         """释放分布式锁"""
-        self.warm.release_lock(lock_name)
+        return self.warm.release_lock(lock_name)
     
     # ========== 统计信息 ==========
     
     def get_stats(self) -> dict:
-        """获取统计信息"""
-        return {
-            "hot": self.hot.get_stats(),
+        """
+        获取统计信息
+        
+        热存储统计实时计算；温/冷存储统计最多滞后 stats_ttl 秒，
+        过期时先返回旧值并在后台线程刷新
+        """
+        refreshed_at, slow_stats = self._stats_cache
+        
+        if slow_stats is None:
+            slow_stats = self._refresh_slow_stats()
+        elif time.monotonic() - refreshed_at >= self.stats_ttl:
+            self._schedule_stats_refresh()
+        
+        return {"hot": self.hot.get_stats(), **slow_stats}
+    
+    def _refresh_slow_stats(self) -> dict:
+        """刷新温/冷存储统计"""
+        slow_stats = {
             "warm": self.warm.get_stats(),
             "cold": self.cold.get_storage_size()
         }
+        self._stats_cache = (time.monotonic(), slow_stats)
+        return slow_stats
+    
+    def _schedule_stats_refresh(self):
+        """在后台线程刷新统计（同一时间最多一个）"""
+        with self._stats_lock:
+            if self._stats_refreshing:
+                return
+            self._stats_refreshing = True
+        
+        threading.Thread(
+            target=self._refresh_stats_in_background,
+            name="storage-stats",
+            daemon=True
+        ).start()
+    
+    def _refresh_stats_in_background(self):
+        """后台刷新线程入口"""
+        try:
+            self._refresh_slow_stats()
+        finally:
+            self._stats_refreshing = False
     
     # ========== 数据同步 ==========
     
@@ -277,32 +495,48 @@ class StorageManager:
             best_ask = self.hot.get_best_ask()
             
             if best_bid and best_ask:
-                bids = [
-                    (price, self.hot.get_depth_at_price(price, "bid"))
-                    for price in self.hot.sorted_bids[:10]
-                ]
-                asks = [
-                    (price, self.hot.get_depth_at_price(price, "ask"))
-                    for price in self.hot.sorted_asks[:10]
-                ]
+                # 一次遍历取出前 10 档 [价格, 数量] 数组
+                bids, asks = self.hot.snapshot_top_n(10)
                 
-                self.save_orderbook_snapshot(
-                    inst_id="BTC-USDT-SWAP",
-                    timestamp=datetime.now(),
-                    bids=bids,
-                    asks=asks
-                )
+                if MSGPACK_AVAILABLE:
+                    self._snapshot_buffer.append(
+                        pack_orderbook_snapshot(datetime.now(), bids, asks)
+                    )
+                    if len(self._snapshot_buffer) >= self.snapshot_batch_size:
+                        self.flush_snapshots()
+                else:
+                    self.cold.submit(
+                        self.cold.save_orderbook_snapshot,
+                        self.sync_inst_id,
+                        datetime.now(),
+                        bids,
+                        asks
+                    )
+            
+            # 保存成交数据：只提交上次同步之后的新增成交，
+            # 一次性转为结构化数组，写线程中按列写入
+            total = self.hot.total_trades
+            n_new = min(total - self._synced_trades, len(self.hot.trades))
+            self._synced_trades = total
             
-            # 保存成交数据
-            trades = list(self.hot.trades)
-            if trades:
-                self.save_trades("BTC-USDT-SWAP", trades)
+            if n_new > 0:
+                trades = list(islice(reversed(self.hot.trades), n_new))[::-1]
+                self.cold.submit(self.cold.save_trades, self.sync_inst_id, trades_to_array(trades))
             
-            logger.debug("💾 数据已同步到冷存储")
+            logger.debug("💾 数据已提交冷存储写线程")
         
         except Exception as e:
             logger.error(f"❌ 同步到冷存储失败: {e}")
     
+    def flush_snapshots(self):
+        """将缓冲的快照压缩为一个块，提交冷存储写线程"""
+        if not self._snapshot_buffer:
+            return
+        
+        block = compress_snapshot_block(self._snapshot_buffer)
+        self._snapshot_buffer = []
+        self.cold.submit(self.cold.save_orderbook_snapshot_batch, self.sync_inst_id, block)
+    
     def reset(self):
         """重置存储"""
         self.hot.reset()
@@ -310,5 +544,9 @@ class StorageManager:
     
     def close(self):
         """关闭存储"""
+        # 先提交缓冲的快照，冷存储关闭时写完队列中的任务
+        self.flush_snapshots()
+        
         self.warm.close()
+        self.cold.close()
         logger.info("🔌 存储管理器已关闭")
@@ -9,9 +9,11 @@
 - 原子操作和过期时间管理
 """
 
+import functools
 import json
+import secrets
 import time
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from datetime import datetime, timedelta
 
 try:
@@ -20,9 +22,41 @@ try:
 except ImportError:
     REDIS_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    # 持仓字典可能内嵌 numpy 标量或非字符串键
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# 服务端 Lua 脚本（连接时预加载，之后每次调用一次 EVALSHA 往返）
+LUA_SCRIPTS = {
+    # 锁释放：仅当值仍为本进程的 token 时才删除（CAS）
+    "unlock": "if redis.call('get',KEYS[1])==ARGV[1] then return redis.call('del',KEYS[1]) else return 0 end",
+    # 递增并设置过期时间（原子）
+    "incr_ttl": "local v = redis.call('INCRBYFLOAT', KEYS[1], ARGV[1]); redis.call('EXPIRE', KEYS[1], ARGV[2]); return v",
+}
+
+# msgpack 值的版本标记（JSON 文本不会以 0x01 开头，迁移期间旧值仍可解析）
+MSGPACK_TAG = b"\x01"
+
 from utils.logger import logger
 
 
+def _msgpack_default(obj: Any) -> Any:
+    """msgpack 无法直接序列化的对象（如 numpy 标量）转为 Python 原生类型"""
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError(f"无法序列化类型: {type(obj)}")
+
+
 class WarmStorageLayer:
     """
     二级存储层 - Redis 共享缓存
@@ -40,7 +74,8 @@ class WarmStorageLayer:
         port: int = 6379,
         db: int = 0,
         password: Optional[str] = None,
-        key_prefix: str = "okx_quant:"
+        key_prefix: str = "okx_quant:",
+        max_connections: int = 32
     ):
         """
         初始化二级存储
@@ -51,16 +86,32 @@ class WarmStorageLayer:
             db: 数据库编号
             password: 密码
             key_prefix: 键前缀
+            max_connections: 连接池最大连接数
         """
         self.host = host
         self.port = port
         self.db = db
         self.password = password
         self.key_prefix = key_prefix
+        self.max_connections = max_connections
+        
+        # 键前缀预编码；热键（持仓/余额/开关）的完整键按实例缓存，避免每次调用拼接分配
+        self._prefix_bytes = key_prefix.encode()
+        self._make_key = functools.lru_cache(maxsize=2048)(self._build_key)
         
+        self.pool: Optional[Any] = None
         self.client: Optional[Any] = None
         self.connected = False
         
+        # Lua 脚本 SHA {名称: sha}
+        self._script_shas: Dict[str, str] = {}
+        
+        # 分布式锁：已持有锁的 token
+        self._lock_tokens: Dict[str, str] = {}
+        
+        # 键空间通知订阅线程
+        self._watch_thread: Optional[Any] = None
+        
         if REDIS_AVAILABLE:
             self._connect()
         else:
@@ -69,28 +120,66 @@ class WarmStorageLayer:
     def _connect(self):
         """连接 Redis"""
         try:
-            self.client = redis.Redis(
+            # 阻塞式连接池：多个策略协程/线程并发使用多条连接，池满时等待而不是报错
+            self.pool = redis.BlockingConnectionPool(
                 host=self.host,
                 port=self.port,
                 db=self.db,
                 password=self.password,
-                decode_responses=True,
+                max_connections=self.max_connections,
+                decode_responses=False,  # 值以 bytes 返回，由 orjson 直接解析
                 socket_timeout=5
             )
+            self.client = redis.Redis(connection_pool=self.pool)
             
             # 测试连接
             self.client.ping()
             self.connected = True
-            logger.info(f"🔥 二级存储 (Redis) 已连接 | {self.host}:{self.port}")
+            
+            # 预加载 Lua 脚本，之后只需一次 EVALSHA
+            self._load_scripts()
+            
+            # 预热连接，避免启动后首批请求的建连延迟
+            self.pre_warm()
+            
+            logger.info(f"🔥 二级存储 (Redis) 已连接 | {self.host}:{self.port} | 连接池: {self.max_connections}")
         
         except Exception as e:
             logger.error(f"❌ Redis 连接失败: {e}")
             logger.warning("⚠️  使用内存模式替代")
             self.connected = False
     
-    def _make_key(self, key: str) -> str:
-        """生成带前缀的键"""
-        return f"{self.key_prefix}{key}"
+    def pre_warm(self, n: int = 4):
+        """
+        预先建立连接池中的连接
+        
+        Args:
+            n: 预热连接数
+        """
+        if self.pool is None:
+            return
+        
+        connections = []
+        
+        try:
+            for _ in range(min(n, self.max_connections)):
+                try:
+                    connection = self.pool.get_connection()
+                except TypeError:
+                    # redis-py < 6 需要 command_name 参数
+                    connection = self.pool.get_connection("_")
+                connections.append(connection)
+        
+        except Exception as e:
+            logger.warning(f"⚠️  Redis 连接预热失败: {e}")
+        
+        finally:
+            for connection in connections:
+                self.pool.release(connection)
+    
+    def _build_key(self, key: str) -> bytes:
+        """生成带前缀的键（bytes，省去 redis-py 再次编码；经 _make_key 缓存调用）"""
+        return self._prefix_bytes + key.encode()
     
     # ========== 基础操作 ==========
     
@@ -108,9 +197,7 @@ class WarmStorageLayer:
         
         try:
             full_key = self._make_key(key)
-            
-            if isinstance(value, (dict, list)):
-                value = json.dumps(value)
+            value = self._encode(value)
             
             if ttl:
                 self.client.setex(full_key, ttl, value)
@@ -141,16 +228,60 @@ class WarmStorageLayer:
             if value is None:
                 return default
             
-            # 尝试解析 JSON
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                return value
+            return self._decode(value)
         
         except Exception as e:
             logger.error(f"❌ 获取键值失败: {e}")
             return default
     
+    def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None):
+        """
+        批量设置键值（单次 pipeline 往返）
+        
+        值的编码与 set 相同：dict/list/bool 为带标记的 msgpack（不可用时为 JSON），
+        其余类型原样写入
+        
+        Args:
+            mapping: {键: 值}
+            ttl: 过期时间（秒）
+        """
+        if not self.connected or not mapping:
+            return
+        
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            
+            for key, value in mapping.items():
+                pipe.set(self._make_key(key), self._encode(value), ex=ttl)
+            
+            pipe.execute()
+        
+        except Exception as e:
+            logger.error(f"❌ 批量设置键值失败: {e}")
+    
+    def _encode(self, value: Any) -> Any:
+        """序列化值（dict/list/bool 转为带版本标记的 msgpack，或 JSON bytes）"""
+        if isinstance(value, (dict, list, bool)):
+            if MSGPACK_AVAILABLE:
+                return MSGPACK_TAG + msgpack.packb(value, use_bin_type=True, default=_msgpack_default)
+            if ORJSON_AVAILABLE:
+                return orjson.dumps(value, option=ORJSON_OPTIONS)
+            return json.dumps(value).encode()
+        return value
+    
+    def _decode(self, value: Any) -> Any:
+        """反序列化值（msgpack / JSON，失败则按字符串返回）"""
+        if MSGPACK_AVAILABLE and isinstance(value, bytes) and value[:1] == MSGPACK_TAG:
+            return msgpack.unpackb(value[1:], raw=False)
+        
+        try:
+            if ORJSON_AVAILABLE:
+                return orjson.loads(value)
+            return json.loads(value)
+        except ValueError:
+            # orjson.JSONDecodeError / json.JSONDecodeError 均为 ValueError 子类
+            return value.decode() if isinstance(value, bytes) else value
+    
     def delete(self, key: str):
         """
         删除键
@@ -190,6 +321,7 @@ class WarmStorageLayer:
             return False
     
     # ========== 账户状态 ==========
+    # 所有币种余额存放在一个 Hash（balances）中：单键 HGETALL 取全部，小 Hash 内存紧凑
     
     def set_balance(self, ccy: str, balance: float):
         """
@@ -199,8 +331,15 @@ class WarmStorageLayer:
             ccy: 币种
             balance: 余额
         """
-        self.set(f"balance:{ccy}", balance)
-        logger.debug(f"💰 更新余额: {ccy} = {balance}")
+        if not self.connected:
+            return
+        
+        try:
+            self.client.hset(self._make_key("balances"), ccy, balance)
+            logger.debug(f"💰 更新余额: {ccy} = {balance}")
+        
+        except Exception as e:
+            logger.error(f"❌ 设置余额失败: {e}")
     
     def get_balance(self, ccy: str) -> float:
         """
@@ -212,9 +351,54 @@ class WarmStorageLayer:
         Returns:
             余额
         """
-        return float(self.get(f"balance:{ccy}", 0.0))
+        if not self.connected:
+            return 0.0
+        
+        try:
+            value = self.client.hget(self._make_key("balances"), ccy)
+            return float(value) if value is not None else 0.0
+        
+        except Exception as e:
+            logger.error(f"❌ 获取余额失败: {e}")
+            return 0.0
+    
+    def get_all_balances(self) -> Dict[str, float]:
+        """
+        获取所有币种余额（单次 HGETALL）
+        
+        Returns:
+            {币种: 余额}
+        """
+        if not self.connected:
+            return {}
+        
+        try:
+            balances = self.client.hgetall(self._make_key("balances"))
+            return {ccy.decode(): float(value) for ccy, value in balances.items()}
+        
+        except Exception as e:
+            logger.error(f"❌ 获取所有余额失败: {e}")
+            return {}
+    
+    def set_balances_bulk(self, balances: Dict[str, float]):
+        """
+        批量设置账户余额（单次 HSET）
+        
+        Args:
+            balances: {币种: 余额}
+        """
+        if not self.connected or not balances:
+            return
+        
+        try:
+            self.client.hset(self._make_key("balances"), mapping=balances)
+            logger.debug(f"💰 批量更新余额: {len(balances)} 个币种")
+        
+        except Exception as e:
+            logger.error(f"❌ 批量设置余额失败: {e}")
     
     # ========== 持仓状态 ==========
+    # 所有持仓存放在一个 Hash（positions）中，字段为产品 ID，值为编码后的持仓记录
     
     def set_position(self, inst_id: str, side: str, size: float, avg_price: float):
         """
@@ -226,16 +410,47 @@ class WarmStorageLayer:
             size: 数量
             avg_price: 平均价格
         """
-        position = {
+        if not self.connected:
+            return
+        
+        try:
+            position = self._make_position(inst_id, side, size, avg_price)
+            self.client.hset(self._make_key("positions"), inst_id, self._encode(position))
+            logger.debug(f"📊 更新持仓: {inst_id} {side} {size} @ {avg_price}")
+        
+        except Exception as e:
+            logger.error(f"❌ 设置持仓失败: {e}")
+    
+    def set_positions_bulk(self, positions: List[tuple]):
+        """
+        批量设置持仓（单次 HSET）
+        
+        Args:
+            positions: [(inst_id, side, size, avg_price), ...]
+        """
+        if not self.connected or not positions:
+            return
+        
+        try:
+            mapping = {
+                inst_id: self._encode(self._make_position(inst_id, side, size, avg_price))
+                for inst_id, side, size, avg_price in positions
+            }
+            self.client.hset(self._make_key("positions"), mapping=mapping)
+            logger.debug(f"📊 批量更新持仓: {len(positions)} 个")
+        
+        except Exception as e:
+            logger.error(f"❌ 批量设置持仓失败: {e}")
+    
+    def _make_position(self, inst_id: str, side: str, size: float, avg_price: float) -> dict:
+        """构造持仓记录"""
+        return {
             "inst_id": inst_id,
             "side": side,
             "size": size,
             "avg_price": avg_price,
             "updated_at": datetime.now().isoformat()
         }
-        
-        self.set(f"position:{inst_id}", position)
-        logger.debug(f"📊 更新持仓: {inst_id} {side} {size} @ {avg_price}")
     
     def get_position(self, inst_id: str) -> Optional[dict]:
         """
@@ -247,11 +462,20 @@ class WarmStorageLayer:
         Returns:
             持仓信息
         """
-        return self.get(f"position:{inst_id}")
+        if not self.connected:
+            return None
+        
+        try:
+            value = self.client.hget(self._make_key("positions"), inst_id)
+            return self._decode(value) if value is not None else None
+        
+        except Exception as e:
+            logger.error(f"❌ 获取持仓失败: {e}")
+            return None
     
     def get_all_positions(self) -> Dict[str, dict]:
         """
-        获取所有持仓
+        获取所有持仓（单次 HGETALL）
         
         Returns:
             {inst_id: position}
@@ -260,21 +484,36 @@ class WarmStorageLayer:
             return {}
         
         try:
-            pattern = self._make_key("position:*")
-            positions = {}
-            
-            for key in self.client.scan_iter(match=pattern):
-                inst_id = key.split(":")[-1]
-                position = self.get(f"position:{inst_id}")
-                if position:
-                    positions[inst_id] = position
-            
-            return positions
+            positions = self.client.hgetall(self._make_key("positions"))
+            return {
+                inst_id.decode(): self._decode(value)
+                for inst_id, value in positions.items()
+            }
         
         except Exception as e:
             logger.error(f"❌ 获取所有持仓失败: {e}")
             return {}
     
+    def iter_positions(self, count: int = 1000):
+        """
+        逐批遍历持仓（HSCAN 游标），持仓很多时调用方无需等待全部返回
+        
+        Args:
+            count: 每批扫描的字段数提示
+        
+        Yields:
+            (inst_id, position)
+        """
+        if not self.connected:
+            return
+        
+        try:
+            for inst_id, value in self.client.hscan_iter(self._make_key("positions"), count=count):
+                yield inst_id.decode(), self._decode(value)
+        
+        except Exception as e:
+            logger.error(f"❌ 遍历持仓失败: {e}")
+    
     def delete_position(self, inst_id: str):
         """
         删除持仓
@@ -282,8 +521,15 @@ class WarmStorageLayer:
         Args:
             inst_id: 产品 ID
         """
-        self.delete(f"position:{inst_id}")
-        logger.debug(f"🗑️  删除持仓: {inst_id}")
+        if not self.connected:
+            return
+        
+        try:
+            self.client.hdel(self._make_key("positions"), inst_id)
+            logger.debug(f"🗑️  删除持仓: {inst_id}")
+        
+        except Exception as e:
+            logger.error(f"❌ 删除持仓失败: {e}")
     
     # ========== 风控参数 ==========
     
@@ -318,7 +564,19 @@ class WarmStorageLayer:
         Args:
             value: 盈亏值
         """
-        self.set("daily_pnl", value, ttl=86400)  # 24小时过期
+        self.set("daily_pnl", value, ttl=86400)  # 24小时过期（SETEX，单次往返）
+    
+    def add_daily_pnl(self, amount: float) -> float:
+        """
+        累加当日盈亏
+        
+        Args:
+            amount: 本次盈亏
+        
+        Returns:
+            累计盈亏
+        """
+        return self.increment_with_ttl("daily_pnl", amount, 86400)
     
     def get_daily_pnl(self) -> float:
         """
@@ -419,6 +677,29 @@ class WarmStorageLayer:
             logger.error(f"❌ 原子递减失败: {e}")
             return 0.0
     
+    def increment_with_ttl(self, key: str, amount: float, ttl: int) -> float:
+        """
+        原子递增并设置过期时间（单次往返）
+        
+        Args:
+            key: 键
+            amount: 增量
+            ttl: 过期时间（秒）
+        
+        Returns:
+            新值
+        """
+        if not self.connected:
+            return 0.0
+        
+        try:
+            full_key = self._make_key(key)
+            return float(self._run_script("incr_ttl", [full_key], [amount, ttl]))
+        
+        except Exception as e:
+            logger.error(f"❌ 原子递增失败: {e}")
+            return 0.0
+    
     def acquire_lock(self, lock_name: str, timeout: int = 10) -> bool:
         """
         获取分布式锁
@@ -435,20 +716,71 @@ class WarmStorageLayer:
         
         try:
             full_key = self._make_key(f"lock:{lock_name}")
-            return self.client.set(full_key, "1", ex=timeout, nx=True)
+            token = secrets.token_hex(8)
+            
+            if not self.client.set(full_key, token, ex=timeout, nx=True):
+                return False
+            
+            self._lock_tokens[lock_name] = token
+            return True
         
         except Exception as e:
             logger.error(f"❌ 获取锁失败: {e}")
             return False
     
-    def release_lock(self, lock_name: str):
+    def release_lock(self, lock_name: str) -> bool:
         """
-        释放分布式锁
+        释放分布式锁（仅释放本进程持有的锁）
         
         Args:
             lock_name: 锁名
+        
+        Returns:
+            是否释放成功（锁已超时或被他人持有时为 False）
+        """
+        token = self._lock_tokens.pop(lock_name, None)
+        if not self.connected or token is None:
+            return False
+        
+        try:
+            full_key = self._make_key(f"lock:{lock_name}")
+            
+            released = self._run_script("unlock", [full_key], [token])
+            
+            if not released:
+                logger.warning(f"⚠️  锁已失效，未释放: {lock_name}")
+            
+            return bool(released)
+        
+        except Exception as e:
+            logger.error(f"❌ 释放锁失败: {e}")
+            return False
+    
+    # ========== Lua 脚本 ==========
+    
+    def _load_scripts(self):
+        """加载全部 Lua 脚本，记录 SHA"""
+        for name, script in LUA_SCRIPTS.items():
+            self._script_shas[name] = self.client.script_load(script)
+    
+    def _run_script(self, name: str, keys: List[Any], args: List[Any]) -> Any:
+        """
+        通过 EVALSHA 执行已加载的脚本
+        
+        Args:
+            name: 脚本名
+            keys: KEYS
+            args: ARGV
+        
+        Returns:
+            脚本返回值
         """
-        self.delete(f"lock:{lock_name}")
+        try:
+            return self.client.evalsha(self._script_shas[name], len(keys), *keys, *args)
+        except redis.exceptions.NoScriptError:
+            # Redis 重启或 SCRIPT FLUSH 后脚本缓存丢失，重新加载
+            self._load_scripts()
+            return self.client.evalsha(self._script_shas[name], len(keys), *keys, *args)
     
     # ========== 统计信息 ==========
     
@@ -472,9 +804,79 @@ class WarmStorageLayer:
             logger.error(f"❌ 获取统计信息失败: {e}")
             return {"connected": False, "error": str(e)}
     
+    # ========== 键空间通知 ==========
+    
+    def watch_keys(self, names: List[str], callback: Callable[[str], None]) -> bool:
+        """
+        订阅键空间通知，键被（任意进程，包括本进程）修改时回调
+        
+        需要 Redis 开启 notify-keyspace-events（如 "KA"），否则不会收到通知；
+        订阅前检查该配置，未开启时记录警告
+        
+        Args:
+            names: 键名或通配模式（不含前缀），如 ["balances", "switch:*"]
+            callback: 回调函数，参数为不含前缀的键名（在订阅线程中调用）
+        
+        Returns:
+            是否会收到通知（配置无法读取时按已开启处理）
+        """
+        if not self.connected:
+            return False
+        
+        if not self._keyspace_events_enabled():
+            logger.warning(
+                "⚠️  Redis 未开启键空间通知 (notify-keyspace-events)，"
+                "其他进程的修改只能等本地缓存过期后读到"
+            )
+            return False
+        
+        prefix_len = len(self._prefix_bytes)
+        
+        def handler(message):
+            full_key = message["channel"].split(b":", 1)[1]
+            callback(full_key[prefix_len:].decode())
+        
+        try:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            pubsub.psubscribe(**{
+                f"__keyspace@{self.db}__:{self.key_prefix}{name}": handler
+                for name in names
+            })
+            self._watch_thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+            logger.info(f"👂 已订阅键空间通知: {', '.join(names)}")
+            return True
+        
+        except Exception as e:
+            logger.error(f"❌ 订阅键空间通知失败: {e}")
+            return False
+    
+    def _keyspace_events_enabled(self) -> bool:
+        """
+        检查 notify-keyspace-events 是否包含键空间通知（K）及字符串/哈希事件
+        
+        Returns:
+            是否开启（托管 Redis 禁用 CONFIG 时无法判断，按已开启处理）
+        """
+        try:
+            flags = self.client.config_get("notify-keyspace-events").get("notify-keyspace-events", "")
+        except Exception as e:
+            logger.warning(f"⚠️  无法读取 notify-keyspace-events: {e}")
+            return True
+        
+        if isinstance(flags, bytes):
+            flags = flags.decode()
+        
+        return "K" in flags and ("A" in flags or ("$" in flags and "h" in flags))
+    
     def close(self):
         """关闭连接"""
+        if self._watch_thread is not None:
+            self._watch_thread.stop()
+            self._watch_thread = None
+        
         if self.client:
             self.client.close()
+            if self.pool:
+                self.pool.disconnect()
             self.connected = False
             logger.info("🔌 二级存储 (Redis) 已关闭")
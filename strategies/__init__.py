@@ -3,7 +3,7 @@
 包含针对赌徒的所有猎杀策略
 """
 
-from .base_strategy import BaseStrategy
+from .base_strategy import BaseStrategy, OrderBookView, Signal, SignalKind, SignalPool
 from .tactical_strategies import (
     TacticalStrategies,
     FrontRunningStrategy,
@@ -13,6 +13,10 @@ from .tactical_strategies import (
 
 __all__ = [
     "BaseStrategy",
+    "OrderBookView",
+    "Signal",
+    "SignalKind",
+    "SignalPool",
     "TacticalStrategies",
     "FrontRunningStrategy",
     "WallRidingStrategy",
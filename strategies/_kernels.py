@@ -0,0 +1,47 @@
+"""
+策略数值内核
+
+安装 numba 时编译为原生循环，否则退回等价的 NumPy 实现
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _scan_walls_np(depths, threshold):
+    """深度不低于阈值的档位下标（NumPy 实现）"""
+    return np.flatnonzero(depths >= threshold)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def scan_walls(depths, threshold):
+        """
+        深度不低于阈值的档位下标
+        
+        Args:
+            depths: 逐档数量 (float64)
+            threshold: 墙深度阈值
+        
+        Returns:
+            墙所在档位的下标 (int64)
+        """
+        out = np.empty(depths.shape[0], dtype=np.int64)
+        count = 0
+        for i in range(depths.shape[0]):
+            if depths[i] >= threshold:
+                out[count] = i
+                count += 1
+        return out[:count]
+else:
+    scan_walls = _scan_walls_np
+
+
+def warm_up():
+    """预先编译内核（避免首个行情更新承担 JIT 编译耗时）"""
+    scan_walls(np.zeros(1, dtype=np.float64), 1.0)
@@ -0,0 +1,75 @@
+"""
+单生产者/单消费者环形缓冲 (SPSC Ring Buffer)
+
+策略 -> 执行器的信号交接：
+- 固定容量（2 的幂），下标按位与回绕
+- 生产者只写 tail，消费者只写 head，无需加锁
+"""
+
+from typing import Any, List, Optional
+
+
+class SignalRing:
+    """
+    SPSC 信号环形缓冲
+    
+    仅支持一个生产者和一个消费者（同一事件循环内的策略与消费协程）
+    """
+    
+    __slots__ = ("capacity", "_mask", "_buffer", "_head", "_tail")
+    
+    def __init__(self, capacity: int = 4096):
+        """
+        初始化环形缓冲
+        
+        Args:
+            capacity: 容量（必须为 2 的幂）
+        """
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError(f"容量必须为 2 的幂: {capacity}")
+        
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self._buffer: List[Any] = [None] * capacity
+        
+        # 单调递增的读写位置（只在各自一端写入）
+        self._head = 0
+        self._tail = 0
+    
+    def push_nowait(self, item: Any) -> bool:
+        """
+        写入一个元素（不阻塞）
+        
+        Args:
+            item: 元素
+        
+        Returns:
+            是否写入成功（缓冲已满时为 False）
+        """
+        tail = self._tail
+        if tail - self._head >= self.capacity:
+            return False
+        
+        self._buffer[tail & self._mask] = item
+        self._tail = tail + 1
+        return True
+    
+    def pop(self) -> Optional[Any]:
+        """
+        取出一个元素
+        
+        Returns:
+            元素，缓冲为空时返回 None
+        """
+        head = self._head
+        if head == self._tail:
+            return None
+        
+        index = head & self._mask
+        item = self._buffer[index]
+        self._buffer[index] = None  # 释放引用
+        self._head = head + 1
+        return item
+    
+    def __len__(self) -> int:
+        return self._tail - self._head
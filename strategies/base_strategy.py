@@ -4,15 +4,226 @@
 """
 
 import asyncio
-from abc import ABC, abstractmethod
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from enum import IntEnum
 from typing import Dict, Optional, Callable
 from datetime import datetime
 
+import numpy as np
+
+from strategies._ring import SignalRing
 from utils.logger import logger
 
 
-class BaseStrategy(ABC):
-    """策略基类"""
+class OrderBookView:
+    """
+    订单簿视图（SoA）
+    
+    预分配的 float64 数组，每次更新原地填充，
+    有效档位为 bids_px[:n_bids] / asks_px[:n_asks]；
+    买一/卖一/中间价/点差在 load 时算好一次，各策略直接读取
+    """
+    
+    __slots__ = (
+        "inst_id", "bids_px", "bids_sz", "asks_px", "asks_sz", "n_bids", "n_asks", "ts_ns",
+        "best_bid", "best_ask", "mid", "spread_bps"
+    )
+    
+    def __init__(self, inst_id: str = "", depth: int = 20):
+        """
+        初始化视图
+        
+        Args:
+            inst_id: 产品 ID
+            depth: 最大档位数
+        """
+        self.inst_id = inst_id
+        self.bids_px = np.zeros(depth, dtype=np.float64)
+        self.bids_sz = np.zeros(depth, dtype=np.float64)
+        self.asks_px = np.zeros(depth, dtype=np.float64)
+        self.asks_sz = np.zeros(depth, dtype=np.float64)
+        self.n_bids = 0
+        self.n_asks = 0
+        self.ts_ns = 0
+        
+        # 盘口（单边为空时为 0.0）
+        self.best_bid = 0.0
+        self.best_ask = 0.0
+        self.mid = 0.0
+        self.spread_bps = 0.0
+    
+    def load(self, inst_id: str, bids, asks, ts_ns: Optional[int] = None):
+        """
+        用一次深度更新填充视图
+        
+        Args:
+            inst_id: 产品 ID
+            bids: [[价格, 数量, ...], ...]（数值或 OKX 原始字符串）
+            asks: [[价格, 数量, ...], ...]
+            ts_ns: 时间戳（纳秒），默认取当前时间
+        """
+        self.inst_id = inst_id
+        self.n_bids = self._fill(bids, self.bids_px, self.bids_sz)
+        self.n_asks = self._fill(asks, self.asks_px, self.asks_sz)
+        self._update_top(ts_ns)
+    
+    def load_book(self, book, ts_ns: Optional[int] = None):
+        """
+        直接从本地订单簿填充视图（不经过中间的档位列表）
+        
+        Args:
+            book: 提供 fill_bids / fill_asks 的订单簿（如 ProfessionalOrderBook）
+            ts_ns: 时间戳（纳秒），默认取当前时间
+        """
+        self.inst_id = book.inst_id
+        self.n_bids = book.fill_bids(self.bids_px, self.bids_sz)
+        self.n_asks = book.fill_asks(self.asks_px, self.asks_sz)
+        self._update_top(ts_ns)
+    
+    def _update_top(self, ts_ns: Optional[int]):
+        """记录时间戳并计算盘口"""
+        self.ts_ns = time.time_ns() if ts_ns is None else ts_ns
+        
+        best_bid = float(self.bids_px[0]) if self.n_bids else 0.0
+        best_ask = float(self.asks_px[0]) if self.n_asks else 0.0
+        self.best_bid = best_bid
+        self.best_ask = best_ask
+        
+        if best_bid and best_ask:
+            mid = (best_bid + best_ask) / 2
+            self.mid = mid
+            self.spread_bps = (best_ask - best_bid) / mid * 10000
+        else:
+            self.mid = 0.0
+            self.spread_bps = 0.0
+    
+    @staticmethod
+    def _fill(levels, prices: np.ndarray, sizes: np.ndarray) -> int:
+        """将档位写入价格/数量数组，返回有效档位数"""
+        n = min(len(levels), len(prices))
+        
+        if n:
+            block = np.asarray(levels[:n], dtype=np.float64)
+            prices[:n] = block[:, 0]
+            sizes[:n] = block[:, 1]
+        
+        return n
+    
+    @property
+    def is_empty(self) -> bool:
+        """是否没有任何档位"""
+        return self.n_bids == 0 and self.n_asks == 0
+    
+    @property
+    def is_two_sided(self) -> bool:
+        """买卖双边是否都有档位"""
+        return self.n_bids > 0 and self.n_asks > 0
+
+
+class SignalKind(IntEnum):
+    """信号类型"""
+    NONE = 0
+    FRONT_RUNNING = 1  # 抢跑
+    WALL_RIDING = 2  # 挂墙
+    SPREAD_CAPTURING = 3  # 点差捕获（双边做市）
+
+
+# 信号方向
+SIDE_BUY = 1
+SIDE_SELL = -1
+SIDE_BOTH = 0  # 双边（做市）
+
+
+@dataclass(slots=True)
+class Signal:
+    """交易信号（固定字段，回调中按属性读取）"""
+    kind: int = SignalKind.NONE
+    inst_id: str = ""
+    side: int = SIDE_BOTH  # SIDE_BUY / SIDE_SELL / SIDE_BOTH
+    price: float = 0.0
+    size: float = 0.0
+    confidence: float = 0.0
+    reason: str = ""
+    meta: Dict = field(default_factory=dict)  # 策略附加参数（如双边报价、点差）
+    
+    # 由 generate_signal 填写
+    strategy: str = ""
+    ts_ns: int = 0  # 生成时间（纳秒时间戳）
+    
+    @property
+    def timestamp(self) -> str:
+        """ISO 格式时间（按需格式化，不在信号热路径上计算）"""
+        return datetime.fromtimestamp(self.ts_ns / 1e9).isoformat()
+    
+    def copy(self) -> "Signal":
+        """复制信号（不属于对象池，回调需要在返回后保留信号时使用）"""
+        return replace(self, meta=dict(self.meta))
+
+
+class SignalPool:
+    """
+    Signal 对象池（空闲链表）
+    
+    信号在回调完成后归还复用，避免高频策略持续分配对象；
+    回调收到的是池中对象，返回后其字段会被清空并重用（见 BaseStrategy.set_signal_callback）
+    """
+    
+    __slots__ = ("size", "_free")
+    
+    def __init__(self, size: int = 64):
+        """
+        初始化对象池
+        
+        Args:
+            size: 预分配数量（也是空闲链表上限）
+        """
+        self.size = size
+        self._free: deque = deque(Signal() for _ in range(size))
+    
+    def acquire(self) -> Signal:
+        """取出一个空白信号（池空时新建）"""
+        if self._free:
+            return self._free.pop()
+        return Signal()
+    
+    def release(self, signal: Signal):
+        """
+        清空并归还信号
+        
+        Args:
+            signal: 信号
+        """
+        if len(self._free) >= self.size:
+            return
+        
+        signal.kind = SignalKind.NONE
+        signal.inst_id = ""
+        signal.side = SIDE_BOTH
+        signal.price = 0.0
+        signal.size = 0.0
+        signal.confidence = 0.0
+        signal.reason = ""
+        signal.meta.clear()
+        signal.strategy = ""
+        signal.ts_ns = 0
+        self._free.append(signal)
+
+
+class BaseStrategy:
+    """
+    策略基类
+    
+    子类按需覆盖 on_market_data / on_orderbook / on_trade；
+    深度逻辑写在同步的 scan(view) 中，on_orderbook 默认调用 scan 并投递信号；
+    子类需在 __slots__ 中声明自己的属性
+    """
+    
+    __slots__ = (
+        "name", "enabled", "signals_generated", "signals_executed", "on_signal_callback",
+        "ring", "_signal_ready", "_consumer_task", "_closing", "signal_pool"
+    )
     
     def __init__(self, name: str):
         """
@@ -29,9 +240,15 @@ class BaseStrategy(ABC):
         # 回调函数
         self.on_signal_callback: Optional[Callable] = None
         
+        # 信号交接：策略写入环形缓冲，单个消费协程取出并调用回调
+        self.ring = SignalRing(capacity=4096)
+        self._signal_ready = asyncio.Event()
+        self._consumer_task: Optional[asyncio.Task] = None
+        self._closing = False
+        self.signal_pool = SignalPool()
+        
         logger.info(f"📊 策略初始化: {self.name}")
     
-    @abstractmethod
     async def on_market_data(self, data: Dict):
         """
         处理市场数据
@@ -41,17 +258,29 @@ class BaseStrategy(ABC):
         """
         pass
     
-    @abstractmethod
-    async def on_orderbook(self, data: Dict):
+    async def on_orderbook(self, view: OrderBookView):
         """
         处理深度数据
         
         Args:
-            data: 深度数据
+            view: 订单簿视图
         """
-        pass
+        signal = self.scan(view)
+        if signal is not None:
+            await self.generate_signal(signal)
+    
+    def scan(self, view: OrderBookView) -> Optional[Signal]:
+        """
+        扫描深度（同步，无 IO）
+        
+        Args:
+            view: 订单簿视图
+        
+        Returns:
+            需要投递的信号（从 signal_pool 取出），无信号时返回 None
+        """
+        return None
     
-    @abstractmethod
     async def on_trade(self, data: Dict):
         """
         处理成交数据
@@ -61,42 +290,86 @@ class BaseStrategy(ABC):
         """
         pass
     
-    async def generate_signal(self, signal: Dict) -> bool:
+    async def generate_signal(self, signal: Signal) -> bool:
         """
         生成交易信号
         
         Args:
-            signal: 信号信息
+            signal: 信号（原地填写策略名和时间戳；投递后归还 signal_pool）
         
         Returns:
-            是否成功发送
+            是否成功提交（回调由消费协程异步调用）
         """
+        signal.strategy = self.name
+        signal.ts_ns = time.time_ns()
         self.signals_generated += 1
         
-        logger.log_strategy_signal({
-            "strategy": self.name,
-            "timestamp": datetime.now().isoformat(),
-            **signal
-        })
+        logger.log_strategy_signal(signal)
+        
+        if self.on_signal_callback is None:
+            self.signal_pool.release(signal)
+            return False
         
-        # 调用回调函数
-        if self.on_signal_callback:
+        if not self.ring.push_nowait(signal):
+            logger.warning(f"⚠️  策略 {self.name} 信号缓冲已满，丢弃信号")
+            self.signal_pool.release(signal)
+            return False
+        
+        self._signal_ready.set()
+        
+        if self._consumer_task is None:
+            self._consumer_task = asyncio.get_running_loop().create_task(self._consume_signals())
+        
+        return True
+    
+    async def _consume_signals(self):
+        """信号消费协程：有信号时批量投递，空闲时等待唤醒"""
+        while True:
+            await self._deliver_pending()
+            if self._closing:
+                return
+            self._signal_ready.clear()
+            await self._signal_ready.wait()
+    
+    async def _deliver_pending(self):
+        """投递环形缓冲中的全部信号（回调返回后信号归还对象池）"""
+        ring = self.ring
+        pool = self.signal_pool
+        
+        while (signal := ring.pop()) is not None:
+            callback = self.on_signal_callback
+            
             try:
-                await self.on_signal_callback(signal)
-                self.signals_executed += 1
-                return True
-            except Exception as e:
-                logger.error(f"❌ 信号回调失败: {e}")
-                return False
+                if callback is not None:
+                    await callback(signal)
+                    self.signals_executed += 1
+            except Exception:
+                logger.exception("❌ 信号回调失败")
+            finally:
+                pool.release(signal)
+    
+    async def close(self):
+        """停止信号消费协程（先投递完缓冲中的信号）"""
+        if self._consumer_task is None:
+            return
         
-        return False
+        self._closing = True
+        self._signal_ready.set()
+        await self._consumer_task
+        
+        self._consumer_task = None
+        self._closing = False
     
     def set_signal_callback(self, callback: Callable):
         """
         设置信号回调函数
         
+        回调收到的是对象池中的信号，回调返回（await 结束）后即被清空并重用：
+        需要在返回后继续使用（如排队交给执行引擎）时，必须保留 signal.copy()，
+        而不是信号本身
+        
         Args:
-            callback: 回调函数
+            callback: 异步回调函数 async (signal: Signal) -> None
         """
         self.on_signal_callback = callback
         logger.info(f"📝 策略 {self.name} 信号回调已设置")
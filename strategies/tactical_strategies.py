@@ -3,8 +3,15 @@
 针对赌徒的三种战术
 """
 
+from collections import deque
+from decimal import Decimal
 from typing import Optional, Dict, List
-from strategies.base_strategy import BaseStrategy
+from time import monotonic
+
+import numpy as np
+
+from strategies._kernels import scan_walls, warm_up
+from strategies.base_strategy import BaseStrategy, OrderBookView, Signal, SignalKind, SIDE_BOTH
 from orderbook.pro_orderbook import ProfessionalOrderBook
 from orderbook.microstructure_features import MicrostructureFeatures
 from utils.logger import logger
@@ -22,7 +29,8 @@ class TacticalStrategies:
         orderbook: ProfessionalOrderBook,
         features: MicrostructureFeatures,
         execution,  # ExecutionEngine
-        kill_switch  # RiskKillSwitch
+        kill_switch,  # RiskKillSwitch
+        tick_size: float
     ):
         """
         初始化战术策略管理器
@@ -32,6 +40,7 @@ class TacticalStrategies:
             features: 微观结构特征提取器
             execution: 执行引擎
             kill_switch: 风险熔断系统
+            tick_size: 交易对的最小价格变动单位（OKX 产品信息 tickSz）
         """
         self.orderbook = orderbook
         self.features = features
@@ -40,8 +49,15 @@ class TacticalStrategies:
         
         # 初始化三个策略
         self.front_running = FrontRunningStrategy(orderbook, features)
-        self.wall_riding = WallRidingStrategy(orderbook, features)
+        self.wall_riding = WallRidingStrategy(orderbook, features, tick_size)
         self.spread_capturing = SpreadCapturingStrategy(orderbook, features)
+        self.strategies = (self.front_running, self.wall_riding, self.spread_capturing)
+        
+        # 预编译数值内核
+        warm_up()
+        
+        # 深度视图（各策略共享，每次运行原地刷新）
+        self.view = OrderBookView(orderbook.inst_id, depth=20)
         
         # 运行状态
         self.running = False
@@ -54,25 +70,44 @@ class TacticalStrategies:
             return
 
         try:
-            # 获取深度数据
-            orderbook_data = self.orderbook.get_summary()
+            # 获取深度数据（订单簿直接写入视图数组）
+            view = self.view
+            view.load_book(self.orderbook)
 
-            if not orderbook_data:
+            if view.is_empty:
                 return
 
-            inst_id = orderbook_data.get("inst_id", "")
-
-            # 运行抢跑策略
-            await self.front_running.on_orderbook(orderbook_data)
-
-            # 运行挂墙策略
-            await self.wall_riding.on_orderbook(orderbook_data)
+            # 同步扫描（抢跑 / 挂墙 / 点差捕获），只有信号投递是异步的
+            pending = []
+            for strategy in self.strategies:
+                signal = strategy.scan(view)
+                if signal is not None:
+                    pending.append(strategy.generate_signal(signal))
             
-            # 运行点差捕获策略
-            await self.spread_capturing.on_orderbook(orderbook_data)
+            # 单个信号直接 await（gather 会为每个协程创建 Task）
+            if len(pending) == 1:
+                await pending[0]
+            elif pending:
+                await asyncio.gather(*pending)
+        
+        except Exception:
+            logger.exception("❌ 战术策略运行异常")
+    
+    async def on_trade(self, data):
+        """
+        处理逐笔成交（抢跑策略记录大额市价单及最近一次深度扫描的断崖标记）
         
-        except Exception as e:
-            logger.error(f"❌ 战术策略运行异常: {e}")
+        Args:
+            data: 逐笔成交数据（OKX trades 频道的 data 列表）
+        """
+        if not self.kill_switch.is_safe():
+            return
+        
+        try:
+            await self.front_running.on_trade(data)
+        
+        except Exception:
+            logger.exception("❌ 抢跑策略处理成交异常")
     
     async def start(self):
         """启动策略"""
@@ -82,6 +117,11 @@ class TacticalStrategies:
     async def stop(self):
         """停止策略"""
         self.running = False
+        
+        # 投递完已生成的信号
+        for strategy in self.strategies:
+            await strategy.close()
+        
         logger.info("🛑 战术策略已停止")
 
 
@@ -96,6 +136,12 @@ class FrontRunningStrategy(BaseStrategy):
     4. 行动：在他们砸盘之前，瞬间市价做空
     """
     
+    __slots__ = (
+        "orderbook", "features", "depth_drop_threshold", "large_trade_threshold",
+        "depth_levels", "drop_check_levels", "bid_depth_history", "ask_depth_history",
+        "bid_depth_dropped", "ask_depth_dropped"
+    )
+    
     def __init__(self, orderbook, features):
         """
         初始化抢跑策略
@@ -112,10 +158,14 @@ class FrontRunningStrategy(BaseStrategy):
         # 配置
         self.depth_drop_threshold = 0.5  # 深度下降阈值（50%）
         self.large_trade_threshold = 10.0  # 大单阈值
+        self.depth_levels = 20  # 记录的档位数
+        self.drop_check_levels = 5  # 前 N 档任一档断崖即触发
         
-        # 状态
-        self.bid_depth_history = []
-        self.ask_depth_history = []
+        # 状态（每个深度更新一组 float64[depth_levels]，不足的档位补 0）
+        self.bid_depth_history: deque = deque(maxlen=16)
+        self.ask_depth_history: deque = deque(maxlen=16)
+        self.bid_depth_dropped = False
+        self.ask_depth_dropped = False
         
         logger.info(f"🏃 抢跑策略初始化")
         logger.info(f"   - 深度下降阈值: {self.depth_drop_threshold * 100}%")
@@ -125,50 +175,178 @@ class FrontRunningStrategy(BaseStrategy):
         """处理行情数据"""
         pass
     
-    async def on_orderbook(self, data: dict):
-        """处理深度数据"""
-        pass
+    def scan(self, view: OrderBookView) -> Optional[Signal]:
+        """
+        扫描深度
+        
+        记录逐档深度并检测前几档是否断崖式下降（结果供 on_trade 使用）
+        """
+        bids = self._depth_array(view.bids_sz, view.n_bids)
+        asks = self._depth_array(view.asks_sz, view.n_asks)
+        
+        top = self.drop_check_levels
+        if self.bid_depth_history:
+            self.bid_depth_dropped = bool(self.check_depth_drop_vec(bids, self.bid_depth_history[-1])[:top].any())
+            self.ask_depth_dropped = bool(self.check_depth_drop_vec(asks, self.ask_depth_history[-1])[:top].any())
+        
+        self.bid_depth_history.append(bids)
+        self.ask_depth_history.append(asks)
+        
+        return None
     
-    async def on_trade(self, data: dict):
+    def _depth_array(self, sizes: np.ndarray, n: int) -> np.ndarray:
+        """复制前 depth_levels 档数量（超出有效档位的部分置 0）"""
+        depth = sizes[:self.depth_levels].copy()
+        depth[n:] = 0.0
+        return depth
+    
+    async def on_trade(self, data):
         """
         处理成交数据
         
-        检测大额市价单和深度撤单
+        检测大额市价单，并记录对手方向深度是否刚刚断崖式下降（由最近一次 scan 标记）；
+        只记录日志，不生成信号
         """
-        try:
-            if not data:
-                return
-            
-            trade = data[0] if isinstance(data, list) else data
-            inst_id = trade.get("instId", "")
-            
+        if not data:
+            return
+        
+        trades = data if isinstance(data, list) else (data,)
+        
+        for trade in trades:
             # 检查是否是大额市价单
             size = float(trade.get("sz", 0))
-            side = trade.get("side", "")
+            if size < self.large_trade_threshold:
+                continue
             
-            if size >= self.large_trade_threshold:
-                logger.warning(f"🏃 检测到大额市价单: {side} {size} {inst_id}")
-                
-                # 检查对应方向深度是否突然下降
-                if side == "buy":
-                    # 大额买单，检查买方深度
-                    pass
-                else:
-                    # 大额卖单，检查卖方深度
-                    pass
-        
-        except Exception as e:
-            logger.error(f"❌ 抢跑策略处理成交失败: {e}")
-    
-    def check_depth_drop(self, current_depth: float, prev_depth: float) -> bool:
-        """检查深度是否突然下降"""
-        if prev_depth == 0:
-            return False
-        
-        drop_ratio = (prev_depth - current_depth) / prev_depth
+            side = trade.get("side", "")
+            depth_dropped = self.bid_depth_dropped if side == "sell" else self.ask_depth_dropped
+            logger.warning(
+                "🏃 检测到大额市价单: %s %s %s | 对手深度断崖: %s",
+                side, size, trade.get("instId", ""), depth_dropped
+            )
+    
+    def check_depth_drop_vec(self, current: np.ndarray, prev: np.ndarray) -> np.ndarray:
+        """
+        逐档检查深度是否突然下降（无分支）
+        
+        Args:
+            current: 当前逐档深度
+            prev: 上一次逐档深度
+        
+        Returns:
+            布尔掩码（上一次为 0 的档位记为 False）
+        """
+        drop_ratio = np.where(prev > 0, (prev - current) / np.maximum(prev, 1e-12), 0.0)
         return drop_ratio >= self.depth_drop_threshold
 
 
+class WallArrays:
+    """
+    单个产品的墙状态（SoA）
+    
+    以整数 tick 价格为键，按升序存放在预分配数组中，有效部分为 [:n]；
+    查找用 searchsorted，过期与持续时间检查为整列向量运算；
+    seq 记录检测顺序（同一次扫描内按盘口顺序递增）
+    """
+    
+    __slots__ = ("ticks", "first_seen", "last_seen", "depth", "seq", "n", "_next_seq")
+    
+    def __init__(self, capacity: int = 32):
+        """
+        初始化墙状态
+        
+        Args:
+            capacity: 初始容量（不足时自动扩容）
+        """
+        self.ticks = np.empty(capacity, dtype=np.int64)
+        self.first_seen = np.empty(capacity, dtype=np.float64)
+        self.last_seen = np.empty(capacity, dtype=np.float64)
+        self.depth = np.empty(capacity, dtype=np.float64)
+        self.seq = np.empty(capacity, dtype=np.int64)
+        self.n = 0
+        self._next_seq = 0
+    
+    def upsert(self, ticks: np.ndarray, depths: np.ndarray, now: float) -> np.ndarray:
+        """
+        记录本次看到的墙
+        
+        Args:
+            ticks: 墙价格（整数 tick）
+            depths: 墙深度
+            now: 当前时间（monotonic 秒）
+        
+        Returns:
+            新出现的墙的下标（相对 ticks）
+        """
+        n = self.n
+        pos = np.searchsorted(self.ticks[:n], ticks)
+        found = pos < n
+        found[found] = self.ticks[pos[found]] == ticks[found]
+        
+        # 已存在的墙：更新最后见到时间
+        self.last_seen[pos[found]] = now
+        
+        new = np.flatnonzero(~found)
+        if new.size:
+            self._insert(ticks[new], depths[new], now)
+        
+        return new
+    
+    def _insert(self, ticks: np.ndarray, depths: np.ndarray, now: float):
+        """追加新墙并按价格重新排序"""
+        n = self.n
+        total = n + ticks.size
+        
+        if total > self.ticks.size:
+            self._grow(total)
+        
+        self.ticks[n:total] = ticks
+        self.first_seen[n:total] = now
+        self.last_seen[n:total] = now
+        self.depth[n:total] = depths
+        self.seq[n:total] = np.arange(self._next_seq, self._next_seq + ticks.size)
+        self._next_seq += ticks.size
+        self.n = total
+        
+        order = np.argsort(self.ticks[:total], kind="stable")
+        for arr in (self.ticks, self.first_seen, self.last_seen, self.depth, self.seq):
+            arr[:total] = arr[:total][order]
+    
+    def _grow(self, min_capacity: int):
+        """扩容（容量翻倍）"""
+        capacity = max(min_capacity, self.ticks.size * 2)
+        for name in ("ticks", "first_seen", "last_seen", "depth", "seq"):
+            old = getattr(self, name)
+            arr = np.empty(capacity, dtype=old.dtype)
+            arr[:self.n] = old[:self.n]
+            setattr(self, name, arr)
+    
+    def expire(self, now: float, max_idle: float) -> np.ndarray:
+        """
+        移除超过 max_idle 秒未见到的墙
+        
+        Args:
+            now: 当前时间（monotonic 秒）
+            max_idle: 最长未见时间（秒）
+        
+        Returns:
+            被移除的墙价格（整数 tick）
+        """
+        n = self.n
+        keep = (now - self.last_seen[:n]) <= max_idle
+        
+        if keep.all():
+            return self.ticks[:0]
+        
+        removed = self.ticks[:n][~keep]
+        kept = int(keep.sum())
+        for arr in (self.ticks, self.first_seen, self.last_seen, self.depth, self.seq):
+            arr[:kept] = arr[:n][keep]
+        self.n = kept
+        
+        return removed
+
+
 class WallRidingStrategy(BaseStrategy):
     """
     挂墙策略（Wall Riding）
@@ -180,18 +358,29 @@ class WallRidingStrategy(BaseStrategy):
     4. 吃个反弹就跑
     """
     
-    def __init__(self, orderbook, features):
+    __slots__ = (
+        "orderbook", "features", "tick_size", "_price_decimals", "wall_depth_threshold",
+        "wall_persistence_time", "ride_offset", "walls"
+    )
+    
+    def __init__(self, orderbook, features, tick_size: float):
         """
         初始化挂墙策略
         
         Args:
             orderbook: 订单簿
             features: 特征提取器
+            tick_size: 交易对的最小价格变动单位（墙按整数 tick 记录）
         """
+        if tick_size <= 0:
+            raise ValueError(f"tick_size 必须大于 0: {tick_size}")
+        
         super().__init__("挂墙策略")
         
         self.orderbook = orderbook
         self.features = features
+        self.tick_size = tick_size
+        self._price_decimals = max(0, -Decimal(str(tick_size)).as_tuple().exponent)
         
         # 配置
         self.wall_depth_threshold = 100.0  # 墙的深度阈值
@@ -199,7 +388,7 @@ class WallRidingStrategy(BaseStrategy):
         self.ride_offset = 1  # 挂单距离墙的档位数
         
         # 状态
-        self.walls: Dict[str, Dict] = {}  # {inst_id: {price: time}}
+        self.walls: Dict[str, WallArrays] = {}  # {inst_id: 墙状态}，时间为 monotonic 秒
         
         logger.info(f"🧱 挂墙策略初始化")
         logger.info(f"   - 墙深度阈值: {self.wall_depth_threshold}")
@@ -209,54 +398,37 @@ class WallRidingStrategy(BaseStrategy):
         """处理行情数据"""
         pass
     
-    async def on_orderbook(self, data: dict):
+    def scan(self, view: OrderBookView) -> Optional[Signal]:
         """
-        处理深度数据
+        扫描深度
         
-        检测墙的存在
+        检测墙的存在（只更新墙状态，挂墙由 can_ride_wall 查询）
         """
-        try:
-            if not data:
-                return
-            
-            orderbook = data[0] if isinstance(data, list) else data
-            inst_id = orderbook.get("instId", "")
-            
-            # 检查买盘是否有墙
-            bids = orderbook.get("bids", [])
-            
-            for i, level in enumerate(bids[:20]):  # 检查前20档
-                price = float(level[0])
-                depth = float(level[1])
-                
-                if depth >= self.wall_depth_threshold:
-                    # 检测到墙
-                    if inst_id not in self.walls:
-                        self.walls[inst_id] = {}
-                    
-                    if price not in self.walls[inst_id]:
-                        self.walls[inst_id][price] = {
-                            "first_seen": datetime.now(),
-                            "last_seen": datetime.now(),
-                            "depth": depth
-                        }
-                        logger.info(f"🧱 检测到墙: {inst_id} @ {price}, 深度={depth}")
-                    else:
-                        # 更新最后见到时间
-                        self.walls[inst_id][price]["last_seen"] = datetime.now()
+        inst_id = view.inst_id
+        now = monotonic()
+        
+        # 检查买盘是否有墙（前20档，一次扫描找出所有墙）
+        n = min(view.n_bids, 20)
+        wall_idx = scan_walls(view.bids_sz[:n], self.wall_depth_threshold)
+        
+        walls = self.walls.get(inst_id)
+        if walls is None:
+            walls = self.walls[inst_id] = WallArrays()
+        
+        if wall_idx.size:
+            prices = view.bids_px[wall_idx]
+            depths = view.bids_sz[wall_idx]
+            ticks = np.rint(prices / self.tick_size).astype(np.int64)
             
-            # 检查墙是否消失
-            current_time = datetime.now()
-            if inst_id in self.walls:
-                for price, wall_info in list(self.walls[inst_id].items()):
-                    persistence = (current_time - wall_info["last_seen"]).total_seconds()
-                    
-                    if persistence > 2:  # 2秒未见到，认为墙消失了
-                        del self.walls[inst_id][price]
-                        logger.info(f"🧱 墙消失: {inst_id} @ {price}")
-        
-        except Exception as e:
-            logger.error(f"❌ 挂墙策略处理深度失败: {e}")
+            # 检测到新墙
+            for i in walls.upsert(ticks, depths, now).tolist():
+                logger.info("🧱 检测到墙: %s @ %s, 深度=%s", inst_id, prices[i], depths[i])
+        
+        # 检查墙是否消失（2秒未见到，认为墙消失了）
+        for tick in walls.expire(now, 2.0).tolist():
+            logger.info("🧱 墙消失: %s @ %s", inst_id, self._tick_to_price(tick))
+        
+        return None
     
     async def on_trade(self, data: dict):
         """处理成交数据"""
@@ -272,30 +444,33 @@ class WallRidingStrategy(BaseStrategy):
         Returns:
             {"wall_price": price, "ride_price": price} 或 None
         """
-        try:
-            if inst_id not in self.walls or not self.walls[inst_id]:
-                return None
-            
-            current_time = datetime.now()
-            
-            # 检查是否有持续存在的墙
-            for price, wall_info in self.walls[inst_id].items():
-                persistence = (current_time - wall_info["first_seen"]).total_seconds()
-                
-                if persistence >= self.wall_persistence_time:
-                    # 这是一个真实的墙，可以挂
-                    return {
-                        "wall_price": price,
-                        "ride_price": price * (1 + 0.001),  # 在墙上方 0.1%
-                        "wall_depth": wall_info["depth"],
-                        "persistence": persistence
-                    }
-            
+        walls = self.walls.get(inst_id)
+        if walls is None or walls.n == 0:
             return None
         
-        except Exception as e:
-            logger.error(f"❌ 检查是否可挂墙失败: {e}")
+        now = monotonic()
+        
+        # 检查是否有持续存在的墙（满足条件的墙中取最早检测到的）
+        persistence = now - walls.first_seen[:walls.n]
+        qualified = np.flatnonzero(persistence >= self.wall_persistence_time)
+        
+        if not qualified.size:
             return None
+        
+        idx = int(qualified[walls.seq[qualified].argmin()])
+        
+        # 这是一个真实的墙，可以挂
+        price = self._tick_to_price(int(walls.ticks[idx]))
+        return {
+            "wall_price": price,
+            "ride_price": price * (1 + 0.001),  # 在墙上方 0.1%
+            "wall_depth": float(walls.depth[idx]),
+            "persistence": float(persistence[idx])
+        }
+    
+    def _tick_to_price(self, tick: int) -> float:
+        """整数 tick 转回价格"""
+        return round(tick * self.tick_size, self._price_decimals)
 
 
 class SpreadCapturingStrategy(BaseStrategy):
@@ -308,6 +483,11 @@ class SpreadCapturingStrategy(BaseStrategy):
     3. 双向吃赌徒的市价单
     """
     
+    __slots__ = (
+        "orderbook", "features", "min_spread_bps", "max_spread_bps", "position_size",
+        "active_spreads", "log_interval", "_last_log_ts"
+    )
+    
     def __init__(self, orderbook, features):
         """
         初始化点差捕获策略
@@ -329,6 +509,10 @@ class SpreadCapturingStrategy(BaseStrategy):
         # 状态
         self.active_spreads: Dict[str, Dict] = {}
         
+        # 大点差每个深度更新都可能出现，日志按间隔节流
+        self.log_interval = 1.0  # 秒
+        self._last_log_ts = 0.0
+        
         logger.info(f"📏 点差捕获策略初始化")
         logger.info(f"   - 最小点差: {self.min_spread_bps} bps ({self.min_spread_bps/100}%)")
         logger.info(f"   - 最大点差: {self.max_spread_bps} bps ({self.max_spread_bps/100}%)")
@@ -337,53 +521,38 @@ class SpreadCapturingStrategy(BaseStrategy):
         """处理行情数据"""
         pass
     
-    async def on_orderbook(self, data: dict):
+    def scan(self, view: OrderBookView) -> Optional[Signal]:
         """
-        处理深度数据
+        扫描深度
         
-        检测大点差并做市
+        检测大点差并生成做市信号
         """
-        try:
-            if not data:
-                return
-            
-            orderbook = data[0] if isinstance(data, list) else data
-            inst_id = orderbook.get("instId", "")
-            
-            # 获取买一卖一
-            bids = orderbook.get("bids", [])
-            asks = orderbook.get("asks", [])
-            
-            if not bids or not asks:
-                return
-            
-            best_bid = float(bids[0][0])
-            best_ask = float(asks[0][0])
-            
-            # 计算点差
-            spread = best_ask - best_bid
-            mid_price = (best_bid + best_ask) / 2
-            spread_bps = (spread / mid_price) * 10000
-            
-            # 检查点差是否足够大
-            if self.min_spread_bps <= spread_bps <= self.max_spread_bps:
-                logger.info(f"📏 检测到大点差: {inst_id}, {spread_bps:.1f} bps ({spread_bps/100:.2f}%)")
-                
-                # 生成做市信号
-                await self._generate_market_making_signal(
-                    inst_id, best_bid, best_ask, spread_bps
-                )
-        
-        except Exception as e:
-            logger.error(f"❌ 点差捕获策略处理深度失败: {e}")
-    
-    async def _generate_market_making_signal(
+        # 买一卖一（视图加载时已算好点差，单边为空时为 0）
+        spread_bps = view.spread_bps
+        
+        # 检查点差是否足够大
+        if spread_bps <= 0 or not (self.min_spread_bps <= spread_bps <= self.max_spread_bps):
+            return None
+        
+        inst_id = view.inst_id
+        
+        now = monotonic()
+        if now - self._last_log_ts >= self.log_interval:
+            self._last_log_ts = now
+            log_info = logger.info
+            log_info("📏 检测到大点差: %s, %.1f bps (%.2f%%)", inst_id, spread_bps, spread_bps / 100)
+            log_info("📏 生成点差捕获信号: %s, 点差=%.2f%%", inst_id, spread_bps / 100)
+        
+        # 生成做市信号
+        return self._make_market_making_signal(inst_id, view.best_bid, view.best_ask, spread_bps)
+    
+    def _make_market_making_signal(
         self,
         inst_id: str,
         best_bid: float,
         best_ask: float,
         spread_bps: float
-    ):
+    ) -> Signal:
         """
         生成做市信号
         
@@ -392,27 +561,24 @@ class SpreadCapturingStrategy(BaseStrategy):
             best_bid: 买一
             best_ask: 卖一
             spread_bps: 点差（基点）
-        """
-        try:
-            signal = {
-                "type": "SPREAD_CAPTURING",
-                "action": "market_making",
-                "instId": inst_id,
-                "bid_price": best_bid,
-                "ask_price": best_ask,
-                "spread_bps": spread_bps,
-                "size": self.position_size,
-                "confidence": 0.8,
-                "reason": f"点差扩大至 {spread_bps/100:.2f}%，做市套利"
-            }
-            
-            logger.info(f"📏 生成点差捕获信号: {inst_id}, 点差={spread_bps/100:.2f}%")
-            
-            # 发送信号
-            await self.generate_signal(signal)
         
-        except Exception as e:
-            logger.error(f"❌ 生成点差捕获信号失败: {e}")
+        Returns:
+            信号（由调用方通过 generate_signal 投递）
+        """
+        signal = self.signal_pool.acquire()
+        signal.kind = SignalKind.SPREAD_CAPTURING
+        signal.inst_id = inst_id
+        signal.side = SIDE_BOTH
+        signal.price = (best_bid + best_ask) / 2
+        signal.size = self.position_size
+        signal.confidence = 0.8
+        signal.reason = f"点差扩大至 {spread_bps/100:.2f}%，做市套利"
+        meta = signal.meta
+        meta["bid_price"] = best_bid
+        meta["ask_price"] = best_ask
+        meta["spread_bps"] = spread_bps
+        
+        return signal
     
     async def on_trade(self, data: dict):
         """处理成交数据"""
@@ -422,6 +588,7 @@ class SpreadCapturingStrategy(BaseStrategy):
 # 导出策略
 __all__ = [
     "TacticalStrategies",
+    "WallArrays",
     "FrontRunningStrategy",
     "WallRidingStrategy",
     "SpreadCapturingStrategy"
@@ -5,12 +5,21 @@
 
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import hmac
 import base64
 import hashlib
 import time
 from datetime import datetime
+from typing import Dict, Tuple
+
+# 高性能 JSON（可选）
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 class OKXTestClient:
@@ -23,6 +32,12 @@ class OKXTestClient:
         self.passphrase = os.getenv('OKX_PASSPHRASE', '2011WHUcry*')
         self.base_url = os.getenv('OKX_BASE_URL', 'https://www.okx.com')
 
+        # 签名密钥（只编码一次）
+        self._secret_bytes = self.secret_key.encode("utf-8")
+
+        # 签名前缀缓存 {(method, path): METHOD + path}
+        self._sign_prefix_cache: Dict[Tuple[str, str], str] = {}
+
         # 代理设置
         http_proxy = os.getenv('HTTP_PROXY')
         https_proxy = os.getenv('HTTPS_PROXY')
@@ -37,15 +52,22 @@ class OKXTestClient:
         else:
             print("⚠️  未检测到代理设置")
 
+        # 复用连接的会话（keep-alive，避免每次请求重新握手 TCP/TLS）
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        if self.proxies:
+            self.session.proxies.update(self.proxies)
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
     def _sign(self, timestamp: str, method: str, request_path: str, body: str = "") -> str:
         """生成签名"""
-        message = timestamp + method.upper() + request_path + body
-        mac = hmac.new(
-            bytes(self.secret_key, encoding="utf8"),
-            bytes(message, encoding="utf-8"),
-            digestmod=hashlib.sha256
-        )
-        return base64.b64encode(mac.digest()).decode()
+        key = (method, request_path)
+        prefix = self._sign_prefix_cache.get(key)
+        if prefix is None:
+            prefix = self._sign_prefix_cache[key] = method.upper() + request_path
+
+        message = (timestamp + prefix + body).encode("utf-8")
+        return base64.b64encode(hmac.digest(self._secret_bytes, message, hashlib.sha256)).decode()
 
     def _request(self, method: str, path: str, params: dict = None, body: dict = None) -> dict:
         """
@@ -63,7 +85,12 @@ class OKXTestClient:
         # 使用 ISO 8601 格式的时间戳（OKX API 要求）
         timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
         url = self.base_url + path
-        body_str = json.dumps(body) if body else ""
+        if not body:
+            body_str = ""
+        elif ORJSON_AVAILABLE:
+            body_str = orjson.dumps(body).decode()
+        else:
+            body_str = json.dumps(body)
 
         # 打印时间戳（调试用）
         print(f"⏰ 请求时间戳: {timestamp}")
@@ -73,7 +100,6 @@ class OKXTestClient:
 
         # 请求头
         headers = {
-            "Content-Type": "application/json",
             "OK-ACCESS-KEY": self.api_key,
             "OK-ACCESS-SIGN": sign_str,
             "OK-ACCESS-TIMESTAMP": timestamp,
@@ -87,13 +113,13 @@ class OKXTestClient:
 
         try:
             if method == "GET":
-                response = requests.get(url, params=params, headers=headers, proxies=self.proxies, timeout=10)
+                response = self.session.get(url, params=params, headers=headers, timeout=10)
             elif method == "POST":
-                response = requests.post(url, data=body_str, headers=headers, proxies=self.proxies, timeout=10)
+                response = self.session.post(url, data=body_str, headers=headers, timeout=10)
             elif method == "DELETE":
-                response = requests.delete(url, data=body_str, headers=headers, proxies=self.proxies, timeout=10)
+                response = self.session.delete(url, data=body_str, headers=headers, timeout=10)
 
-            result = response.json()
+            result = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
             print(f"✅ 状态码: {response.status_code}")
             print(f"📥 响应: {json.dumps(result, indent=2, ensure_ascii=False)}")
 
@@ -112,6 +138,10 @@ class OKXTestClient:
             print(f"❌ 请求失败: {e}")
             raise
 
+    def close(self):
+        """关闭会话（释放连接池）"""
+        self.session.close()
+
     def test_server_time(self):
         """测试 1: 获取服务器时间（不需要认证）"""
         print("\n" + "=" * 60)
@@ -261,6 +291,8 @@ def main():
         print("   3. IP 白名单是否配置")
         print("   4. API 权限是否包含'交易'和'读取'")
 
+    client.close()
+
 
 if __name__ == "__main__":
     main()
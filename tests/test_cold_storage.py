@@ -0,0 +1,250 @@
+"""
+冷存储测试
+"""
+
+import shutil
+import time
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from storage.cold_storage import (
+    ColdStorageLayer,
+    HDF5_AVAILABLE,
+    PARQUET_AVAILABLE,
+    PARTS_DIR,
+    trades_to_array
+)
+
+
+pytestmark = pytest.mark.skipif(not PARQUET_AVAILABLE, reason="需要 pyarrow")
+
+
+def make_trade(trade_id: str, timestamp: float, price: float = 100.0) -> dict:
+    """构造一笔一级存储格式的成交"""
+    return {
+        "price": price,
+        "size": 1.0,
+        "side": "buy",
+        "timestamp": timestamp,
+        "trade_id": trade_id,
+    }
+
+
+@pytest.fixture
+def cold(tmp_path):
+    """Parquet 冷存储（测试结束时停止写线程）"""
+    layer = ColdStorageLayer(data_dir=str(tmp_path), format="parquet")
+    yield layer
+    layer.close()
+
+
+def epoch(text: str) -> float:
+    """日期时间字符串 -> Unix 秒"""
+    return pd.Timestamp(text).timestamp()
+
+
+def today() -> str:
+    """当天日期 (YYYY-MM-DD)"""
+    return pd.Timestamp(time.time(), unit="s").strftime("%Y-%m-%d")
+
+
+# ========== 时间戳单位 ==========
+
+@pytest.mark.parametrize("scale", [1, 1e3, 1e6, 1e9])
+def test_dict_trades_timestamp_unit_by_magnitude(cold, scale):
+    """秒/毫秒/微秒/纳秒时间戳都落到当天的文件"""
+    now = time.time()
+    cold.save_trades("BTC-USDT", [make_trade("1", now * scale)])
+    
+    assert cold.get_available_dates("BTC-USDT", "trades") == [today()]
+    
+    df = cold.load_trades("BTC-USDT", today(), today())
+    assert abs(df["timestamp"].iloc[0].timestamp() - now) < 1e-3
+
+
+def test_trades_to_array_matches_dict_path(cold):
+    """结构化数组与字典两条路径写出的时间戳一致"""
+    now = time.time()
+    
+    arr = trades_to_array([make_trade("1", now)])
+    cold.save_trades("A", arr)
+    cold.save_trades("B", [make_trade("1", now)])
+    
+    a = cold.load_trades("A", today(), today())
+    b = cold.load_trades("B", today(), today())
+    delta = a["timestamp"].iloc[0] - b["timestamp"].iloc[0]
+    assert abs(delta) < pd.Timedelta(microseconds=1)
+    assert abs(arr["ts"][0] - now * 1e9) < 1e3
+
+
+# ========== 去重 ==========
+
+def test_trades_dedupe_by_trade_id(cold):
+    """重复提交的成交按 trade_id 只保留一行（最后写入的值）"""
+    now = time.time()
+    cold.save_trades("BTC-USDT", trades_to_array([make_trade("1", now), make_trade("2", now)]))
+    cold.save_trades("BTC-USDT", trades_to_array([make_trade("2", now, price=101.0)]))
+    
+    df = cold.load_trades("BTC-USDT", today(), today())
+    assert sorted(df["trade_id"]) == ["1", "2"]
+    assert df.loc[df["trade_id"] == "2", "price"].item() == 101.0
+
+
+@pytest.mark.parametrize("as_array", [False, True])
+def test_trades_without_trade_id_are_not_merged(cold, as_array):
+    """没有 trade_id（空字符串）的不同成交不会被去重合并"""
+    now = time.time()
+    trades = [make_trade("", now, price=100.0), make_trade("", now + 0.001, price=100.5)]
+    
+    cold.save_trades("BTC-USDT", trades_to_array(trades) if as_array else trades)
+    cold.save_trades("BTC-USDT", trades_to_array(trades[:1]) if as_array else trades[:1])
+    
+    df = cold.load_trades("BTC-USDT", today(), today())
+    assert len(df) == 3
+
+
+@pytest.mark.skipif(not HDF5_AVAILABLE, reason="需要 h5py")
+def test_hdf5_trades_dedupe_skips_empty_trade_id(tmp_path):
+    """HDF5 与 Parquet 去重语义一致：同 trade_id 覆盖，空 trade_id 追加"""
+    layer = ColdStorageLayer(data_dir=str(tmp_path), format="hdf5")
+    try:
+        now = time.time()
+        layer.save_trades("BTC-USDT", trades_to_array([make_trade("1", now), make_trade("", now)]))
+        layer.save_trades("BTC-USDT", trades_to_array([make_trade("1", now, price=101.0), make_trade("", now)]))
+        
+        df = layer.load_trades("BTC-USDT", today(), today())
+        assert len(df) == 3
+        assert df.loc[df["trade_id"] == "1", "price"].item() == 101.0
+    finally:
+        layer.close()
+
+
+# ========== Parquet 分片与合并 ==========
+
+def test_each_save_appends_a_part(cold, tmp_path):
+    """每次保存只新增一个分片，不重写当天数据；读取时跨分片去重"""
+    ts = epoch("2024-01-01 10:00")
+    cold.save_trades("BTC-USDT", trades_to_array([make_trade("1", ts), make_trade("2", ts + 1)]))
+    cold.save_trades("BTC-USDT", trades_to_array([make_trade("2", ts + 1), make_trade("3", ts + 2)]))
+    
+    parts = sorted((tmp_path / PARTS_DIR / "BTC-USDT_2024-01-01_trades").glob("*.parquet"))
+    assert [p.name for p in parts] == ["00000001.parquet", "00000002.parquet"]
+    assert not (tmp_path / "BTC-USDT_2024-01-01_trades.parquet").exists()
+    
+    df = cold.load_trades("BTC-USDT", "2024-01-01", "2024-01-01")
+    assert list(df["trade_id"]) == ["1", "2", "3"]
+    assert df["timestamp"].is_monotonic_increasing
+    assert cold.get_available_dates("BTC-USDT", "trades") == ["2024-01-01"]
+
+
+def test_day_rollover_compacts_previous_day(cold, tmp_path):
+    """写入新日期时，前一天的分片合并为日文件"""
+    cold.save_trades("BTC-USDT", trades_to_array([make_trade("1", epoch("2024-01-01 23:59"))]))
+    cold.save_trades("BTC-USDT", trades_to_array([make_trade("1", epoch("2024-01-01 23:59"))]))
+    cold.save_trades("BTC-USDT", trades_to_array([make_trade("2", epoch("2024-01-02 00:01"))]))
+    
+    assert (tmp_path / "BTC-USDT_2024-01-01_trades.parquet").exists()
+    assert not (tmp_path / PARTS_DIR / "BTC-USDT_2024-01-01_trades").exists()
+    assert (tmp_path / PARTS_DIR / "BTC-USDT_2024-01-02_trades").is_dir()
+    
+    df = cold.load_trades("BTC-USDT", "2024-01-01", "2024-01-02")
+    assert list(df["trade_id"]) == ["1", "2"]
+
+
+def test_close_compacts_and_new_parts_continue_after_it(tmp_path):
+    """close 时合并分片；重新打开后的写入作为新分片叠加在日文件之上"""
+    ts = epoch("2024-01-01 10:00")
+    
+    layer = ColdStorageLayer(data_dir=str(tmp_path), format="parquet")
+    layer.save_trades("BTC-USDT", trades_to_array([make_trade("1", ts), make_trade("2", ts + 1)]))
+    layer.close()
+    
+    assert (tmp_path / "BTC-USDT_2024-01-01_trades.parquet").exists()
+    assert not (tmp_path / PARTS_DIR / "BTC-USDT_2024-01-01_trades").exists()
+    
+    layer = ColdStorageLayer(data_dir=str(tmp_path), format="parquet")
+    layer.save_trades("BTC-USDT", trades_to_array([make_trade("2", ts + 1, price=101.0)]))
+    
+    df = layer.load_trades("BTC-USDT", "2024-01-01", "2024-01-01")
+    assert list(df["trade_id"]) == ["1", "2"]
+    assert list(df["price"]) == [100.0, 101.0]
+    layer.close()
+
+
+def test_parts_left_after_compaction_are_not_read_twice(tmp_path):
+    """合并后未删除的分片（替换日文件后进程退出）不会被重复读取"""
+    layer = ColdStorageLayer(data_dir=str(tmp_path), format="parquet")
+    for second in range(2):
+        layer.save_orderbook_snapshot(
+            "BTC-USDT",
+            datetime(2024, 1, 1, 10, 0, second),
+            [(100.0, 1.0)],
+            [(101.0, 1.0)]
+        )
+    
+    parts_dir = tmp_path / PARTS_DIR / "BTC-USDT_2024-01-01_orderbook"
+    shutil.copytree(parts_dir, tmp_path / "saved_parts")
+    layer.close()
+    shutil.copytree(tmp_path / "saved_parts", parts_dir)
+    
+    layer = ColdStorageLayer(data_dir=str(tmp_path), format="parquet")
+    assert len(layer.load_orderbook_snapshot("BTC-USDT", "2024-01-01")) == 4
+    layer.close()
+    
+    assert not parts_dir.exists()
+
+
+def test_ohlcv_resave_keeps_last_value_per_timestamp(cold):
+    """重复保存的 K 线按时间戳保留最后一次的值"""
+    def candles(start: str, n: int, close: float) -> pd.DataFrame:
+        return pd.DataFrame({
+            "timestamp": pd.date_range(start, periods=n, freq="min"),
+            "open": 1.0,
+            "high": 1.0,
+            "low": 1.0,
+            "close": close,
+            "volume": 1.0,
+        })
+    
+    cold.save_ohlcv("BTC-USDT", candles("2024-01-01 10:00", 3, 1.0))
+    cold.save_ohlcv("BTC-USDT", candles("2024-01-01 10:02", 2, 2.0))
+    
+    df = cold.load_ohlcv("BTC-USDT", "2024-01-01", "2024-01-01")
+    assert len(df) == 4
+    assert list(df["close"]) == [1.0, 1.0, 2.0, 2.0]
+
+
+def test_delete_data_removes_parts(cold, tmp_path):
+    """删除数据时一并删除未合并的分片"""
+    cold.save_trades("BTC-USDT", trades_to_array([make_trade("1", epoch("2024-01-01 10:00"))]))
+    cold.delete_data("BTC-USDT", "2024-01-01", "trades")
+    
+    assert cold.get_available_dates("BTC-USDT", "trades") == []
+    assert cold.load_trades("BTC-USDT", "2024-01-01", "2024-01-01").empty
+
+
+# ========== 后台写线程 ==========
+
+def test_submitted_writes_are_visible_after_load(cold):
+    """submit 提交的写入按顺序执行，load_* 读取前先等待队列写完"""
+    ts = epoch("2024-01-01 10:00")
+    for i in range(3):
+        cold.submit(cold.save_trades, "BTC-USDT", trades_to_array([make_trade(str(i), ts + i)]))
+    
+    df = cold.load_trades("BTC-USDT", "2024-01-01", "2024-01-01")
+    assert list(df["trade_id"]) == ["0", "1", "2"]
+
+
+def test_close_drains_the_queue(tmp_path):
+    """close 先写完队列中的任务再停止写线程"""
+    layer = ColdStorageLayer(data_dir=str(tmp_path), format="parquet")
+    layer.submit(
+        layer.save_trades,
+        "BTC-USDT",
+        trades_to_array([make_trade("1", epoch("2024-01-01 10:00"))])
+    )
+    layer.close()
+    
+    assert (tmp_path / "BTC-USDT_2024-01-01_trades.parquet").exists()
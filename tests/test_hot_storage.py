@@ -0,0 +1,236 @@
+"""
+一级存储测试（整数 tick 订单簿）
+"""
+
+import numpy as np
+import pytest
+
+from storage.hot_storage import HotStorageLayer, _depth_imbalance, _depth_imbalance_np
+
+
+def make_book(tick_size: float = 1.0, book_ticks: int = 64, max_depth: int = 400) -> HotStorageLayer:
+    """小窗口订单簿，便于触发窗口边界"""
+    return HotStorageLayer(tick_size, max_trades=16, max_depth=max_depth, book_ticks=book_ticks)
+
+
+def test_tick_size_required():
+    """tick_size 必须为正数"""
+    with pytest.raises(ValueError):
+        HotStorageLayer(0)
+    with pytest.raises(ValueError):
+        HotStorageLayer(-0.1)
+
+
+def test_prices_round_trip_on_tick_grid():
+    """价格按 tick 量化后还原，不带浮点误差"""
+    book = make_book(tick_size=0.1, book_ticks=1 << 12)
+    book.update_bid(100.0, 1.0)
+    book.update_bid(99.9, 2.0)
+    book.update_ask(100.1, 3.0)
+    book.update_ask(100.3, 4.0)
+    
+    assert book.get_best_bid() == (100.0, 1.0)
+    assert book.get_best_ask() == (100.1, 3.0)
+    assert book.sorted_bids == [100.0, 99.9]
+    assert book.sorted_asks == [100.1, 100.3]
+    assert book.get_depth_at_price(99.9, "bid") == 2.0
+
+
+# ========== 窗口外档位 ==========
+
+def test_out_of_window_level_is_rejected():
+    """窗口外的异常价格被丢弃并计数，不平移窗口、不清空订单簿"""
+    book = make_book()
+    book.update_bid(100.0, 1.0)
+    book.update_ask(101.0, 1.0)
+    base_tick = book.base_tick
+    
+    book.update_bid(1000.0, 5.0)
+    book.update_ask(1.0, 5.0)
+    
+    assert book.rejected_levels == 2
+    assert book.base_tick == base_tick
+    assert book.get_best_bid() == (100.0, 1.0)
+    assert book.get_best_ask() == (101.0, 1.0)
+    assert book.get_depth_at_price(1000.0, "bid") == 0.0
+
+
+def test_empty_book_recenters_on_next_price():
+    """订单簿清空后，下一个价格重新定位窗口"""
+    book = make_book()
+    book.update_bid(100.0, 1.0)
+    book.update_bid(100.0, 0.0)
+    
+    book.update_bid(5000.0, 1.0)
+    
+    assert book.rejected_levels == 0
+    assert book.get_best_bid() == (5000.0, 1.0)
+
+
+def test_delete_outside_window_is_ignored():
+    """删除窗口外的价格不报错、不计入拒绝数"""
+    book = make_book()
+    book.update_bid(100.0, 1.0)
+    book.update_bid(1000.0, 0.0)
+    
+    assert book.rejected_levels == 0
+    assert book.get_best_bid() == (100.0, 1.0)
+
+
+# ========== 窗口平移 ==========
+
+@pytest.mark.parametrize("step", [1, -1])
+def test_recenter_follows_mid_price(step):
+    """买一/卖一漂移到窗口边缘附近时窗口以中间价为中心平移，档位保留"""
+    book = make_book()
+    book.update_bid(100.0, 1.0)
+    book.update_ask(101.0, 1.0)
+    base_tick = book.base_tick
+    
+    # 中间价每次移动 1 tick，累计超过 book_ticks // 2 - margin
+    bid, ask = 100.0, 101.0
+    for _ in range(40):
+        book.update_bid(bid, 0.0)
+        book.update_ask(ask, 0.0)
+        bid += step
+        ask += step
+        book.update_bid(bid, 1.0)
+        book.update_ask(ask, 1.0)
+        book.update_bid(bid - 2, 2.0)
+    
+    assert book.rejected_levels == 0
+    assert book.base_tick != base_tick
+    assert book.get_best_bid() == (bid, 1.0)
+    assert book.get_best_ask() == (ask, 1.0)
+    assert book.get_depth_at_price(bid - 2, "bid") == 2.0
+    
+    margin = book.book_ticks // 8
+    assert margin <= book.best_bid_idx < book.book_ticks - margin
+    assert margin <= book.best_ask_idx < book.book_ticks - margin
+
+
+def test_recenter_drops_levels_left_outside():
+    """平移后落到窗口外的远端档位被丢弃"""
+    book = make_book()
+    book.update_bid(100.0, 1.0)
+    book.update_ask(101.0, 1.0)
+    book.update_bid(70.0, 9.0)  # 靠近窗口下沿的远端档位
+    
+    book.update_bid(100.0, 0.0)
+    book.update_ask(101.0, 0.0)
+    book.update_ask(126.0, 1.0)
+    book.update_bid(125.0, 1.0)
+    
+    assert book.get_best_bid() == (125.0, 1.0)
+    assert book.get_best_ask() == (126.0, 1.0)
+    assert book.get_depth_at_price(70.0, "bid") == 0.0
+    assert 70.0 not in book.sorted_bids
+
+
+# ========== 批量更新 ==========
+
+def test_apply_updates_upserts_and_deletes():
+    """批量更新：新增/更新/删除与逐档更新结果一致，买一/卖一正确"""
+    book = make_book(tick_size=0.5, book_ticks=1 << 10)
+    book.apply_updates([100.0, 99.5, 99.0], [1.0, 2.0, 3.0], [100.5, 101.0], [4.0, 5.0])
+    
+    assert book.get_best_bid() == (100.0, 1.0)
+    assert book.get_best_ask() == (100.5, 4.0)
+    
+    # 删除买一和卖一，更新一个中间档位
+    book.apply_updates([100.0, 99.5], [0.0, 7.0], [100.5], [0.0], now=123.0)
+    
+    assert book.get_best_bid() == (99.5, 7.0)
+    assert book.get_best_ask() == (101.0, 5.0)
+    assert book.sorted_bids == [99.5, 99.0]
+    assert book.last_update_time == 123.0
+
+
+def test_apply_updates_rejects_outliers_in_batch():
+    """批量更新中窗口外的新增档位被丢弃并计数，其余档位正常写入"""
+    book = make_book()
+    book.apply_updates([100.0, 99.0, 10_000.0], [1.0, 1.0, 1.0], [101.0, 0.5], [1.0, 1.0])
+    
+    assert book.rejected_levels == 2
+    assert book.sorted_bids == [100.0, 99.0]
+    assert book.sorted_asks == [101.0]
+
+
+def test_apply_updates_centers_empty_book_on_median():
+    """空订单簿按本批新增档位的中位数定位窗口"""
+    book = make_book()
+    book.apply_updates([5000.0, 4999.0], [1.0, 1.0], [5001.0, 5002.0], [1.0, 1.0])
+    
+    assert book.rejected_levels == 0
+    assert book.get_mid_price() == 5000.5
+    assert abs(book.best_bid_idx - book.book_ticks // 2) <= 2
+
+
+def test_apply_updates_delete_only_batch_on_empty_book():
+    """空订单簿上只有删除的批次不定位窗口"""
+    book = make_book()
+    book.apply_updates([100.0], [0.0], [], [])
+    
+    assert book.base_tick is None
+    assert book.get_best_bid() is None
+
+
+# ========== 快照 ==========
+
+def test_snapshot_top_n_orders_levels():
+    """前 n 档快照：买盘降序、卖盘升序"""
+    book = make_book(book_ticks=1 << 10)
+    for i in range(5):
+        book.update_bid(100.0 - i, 1.0 + i)
+        book.update_ask(101.0 + i, 10.0 + i)
+    
+    bids, asks = book.snapshot_top_n(3)
+    
+    np.testing.assert_array_equal(bids, [[100.0, 1.0], [99.0, 2.0], [98.0, 3.0]])
+    np.testing.assert_array_equal(asks, [[101.0, 10.0], [102.0, 11.0], [103.0, 12.0]])
+
+
+def test_snapshot_top_n_widens_scan_for_sparse_levels():
+    """档位稀疏（间隔超过初始扫描窗口）时扩大扫描范围"""
+    book = make_book(book_ticks=1 << 14)
+    for i in range(4):
+        book.update_bid(5000.0 - 500 * i, 1.0)
+        book.update_ask(5001.0 + 500 * i, 1.0)
+    
+    bids, asks = book.snapshot_top_n(10)
+    
+    assert bids[:, 0].tolist() == [5000.0, 4500.0, 4000.0, 3500.0]
+    assert asks[:, 0].tolist() == [5001.0, 5501.0, 6001.0, 6501.0]
+
+
+def test_snapshot_top_n_empty_book():
+    """空订单簿返回空数组"""
+    bids, asks = make_book().snapshot_top_n(5)
+    
+    assert bids.shape == (0, 2)
+    assert asks.shape == (0, 2)
+
+
+# ========== OFI ==========
+
+def test_ofi_only_counts_levels_near_best():
+    """OFI 只统计买一/卖一附近 max_depth 个 tick 的深度"""
+    book = make_book(book_ticks=1 << 10, max_depth=5)
+    book.update_bid(100.0, 1.0)
+    book.update_bid(96.0, 2.0)
+    book.update_bid(50.0, 1000.0)  # 窗口外的远端大单
+    book.update_ask(101.0, 0.5)
+    book.update_ask(200.0, 1000.0)
+    
+    book._calculate_ofi()
+    ofi = book.ofi_history[(book._ofi_pos - 1) % book.ofi_history.shape[0]]
+    
+    assert ofi == pytest.approx((1.0 + 2.0 - 0.5) / 100.5)
+
+
+def test_depth_imbalance_kernel_matches_numpy():
+    """数值内核与 NumPy 实现一致（两侧长度不同）"""
+    bids = np.array([1.0, 2.0, 3.0])
+    asks = np.array([0.5, 0.25])
+    
+    assert _depth_imbalance(bids, asks) == pytest.approx(_depth_imbalance_np(bids, asks))
@@ -5,47 +5,54 @@
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 from dotenv import load_dotenv
 
 # 加载 .env 文件
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(env_path)
 
+# 环境变量快照（导入时读取一次，之后不再访问 os.environ）
+_ENV: Dict[str, str] = dict(os.environ)
+
 from utils.logger import logger
 
 
 class Config:
     """配置类"""
     
+    # 环境变量快照（Config.get 从这里读取）
+    _CACHE: Dict[str, str] = _ENV
+    
     # ========== API 配置 ==========
-    API_KEY: str = os.getenv("OKX_API_KEY", "")
-    SECRET_KEY: str = os.getenv("OKX_SECRET_KEY", "")
-    PASSPHRASE: str = os.getenv("OKX_PASSPHRASE", "")
-    BASE_URL: str = os.getenv("OKX_BASE_URL", "https://www.okx.com")
+    API_KEY: str = _ENV.get("OKX_API_KEY", "")
+    SECRET_KEY: str = _ENV.get("OKX_SECRET_KEY", "")
+    PASSPHRASE: str = _ENV.get("OKX_PASSPHRASE", "")
+    BASE_URL: str = _ENV.get("OKX_BASE_URL", "https://www.okx.com")
     
     # ========== 日志配置 ==========
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
-    LOG_FILE: str = os.getenv("LOG_FILE", "logs/okx_quant.log")
+    LOG_LEVEL: str = _ENV.get("LOG_LEVEL", "INFO")
+    LOG_FILE: str = _ENV.get("LOG_FILE", "logs/okx_quant.log")
     
     # ========== 交易配置 ==========
-    TRADING_MODE: str = os.getenv("TRADING_MODE", "paper")  # paper=模拟交易, live=实盘交易
-    MAX_POSITION_SIZE: float = float(os.getenv("MAX_POSITION_SIZE", "1000"))
-    MAX_DAILY_LOSS: float = float(os.getenv("MAX_DAILY_LOSS", "0.05"))  # 5%
-    LEVERAGE_LIMIT: int = int(os.getenv("LEVERAGE_LIMIT", "20"))
-    TIMEOUT: int = int(os.getenv("TIMEOUT", "30"))
+    TRADING_MODE: str = _ENV.get("TRADING_MODE", "paper")  # paper=模拟交易, live=实盘交易
+    MAX_POSITION_SIZE: float = float(_ENV.get("MAX_POSITION_SIZE", "1000"))
+    MAX_DAILY_LOSS: float = float(_ENV.get("MAX_DAILY_LOSS", "0.05"))  # 5%
+    LEVERAGE_LIMIT: int = int(_ENV.get("LEVERAGE_LIMIT", "20"))
+    TIMEOUT: int = int(_ENV.get("TIMEOUT", "30"))
     
     # ========== 策略配置 ==========
-    ENABLE_LIQUIDATION_HUNTING: bool = os.getenv("ENABLE_LIQUIDATION_HUNTING", "true").lower() == "true"
-    ENABLE_FUNDING_ARBITRAGE: bool = os.getenv("ENABLE_FUNDING_ARBITRAGE", "true").lower() == "true"
-    ENABLE_MARKET_MAKING: bool = os.getenv("ENABLE_MARKET_MAKING", "false").lower() == "true"
+    ENABLE_LIQUIDATION_HUNTING: bool = _ENV.get("ENABLE_LIQUIDATION_HUNTING", "true").lower() == "true"
+    ENABLE_FUNDING_ARBITRAGE: bool = _ENV.get("ENABLE_FUNDING_ARBITRAGE", "true").lower() == "true"
+    ENABLE_MARKET_MAKING: bool = _ENV.get("ENABLE_MARKET_MAKING", "false").lower() == "true"
     
     # ========== WebSocket 配置 ==========
-    WS_RECONNECT_DELAY: int = int(os.getenv("WS_RECONNECT_DELAY", "5"))
-    WS_PING_INTERVAL: int = int(os.getenv("WS_PING_INTERVAL", "20"))
+    WS_RECONNECT_DELAY: int = int(_ENV.get("WS_RECONNECT_DELAY", "5"))
+    WS_PING_INTERVAL: int = int(_ENV.get("WS_PING_INTERVAL", "20"))
     WS_CHANNELS_BOOK: str = "books-l2-tbt"  # 增量深度数据
     WS_CHANNELS_TRADE: str = "trades"  # 逐笔成交
     DEFAULT_INST_ID: str = "BTC-USDT-SWAP"  # 默认交易对
+    DEFAULT_TICK_SIZE: float = float(_ENV.get("DEFAULT_TICK_SIZE", "0.1"))  # 默认交易对的 tickSz（换交易对时同步修改）
     
     # ========== 系统配置 ==========
     RUNNING: bool = True
@@ -88,8 +95,8 @@ class Config:
     
     @classmethod
     def get(cls, key: str, default: Optional[str] = None) -> Optional[str]:
-        """获取配置值"""
-        return os.getenv(key, default)
+        """获取配置值（读取导入时的环境变量快照）"""
+        return cls._CACHE.get(key, default)
 
 
 # 创建 __init__.py 使 utils 成为一个包
@@ -3,17 +3,278 @@
 提供统一的日志接口，详细记录每一步操作
 """
 
+import atexit
 import logging
 import os
-from datetime import datetime
-from logging.handlers import RotatingFileHandler
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Optional
+
+
+# LOG_LEVEL 环境变量取值 -> 日志级别（未知取值按 INFO 处理）
+_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+
+# ========== 日志前缀与格式串（导入时拼好，调用时只做一次 % 格式化） ==========
+
+_PFX_API_REQ = sys.intern("📤 API 请求: ")
+_PFX_API_RSP = sys.intern("📥 API 响应: ")
+_PFX_PLACE = sys.intern("📌 下单: ")
+_PFX_CANCEL = sys.intern("❌ 撤单: ")
+_PFX_FILLED = sys.intern("✅ 成交: ")
+_PFX_FAILED = sys.intern("⛔ 订单失败: ")
+_PFX_PROFIT = sys.intern("💰 盈利: ")
+_PFX_LOSS = sys.intern("📉 亏损: ")
+_PFX_SIGNAL = sys.intern("🎯 策略信号: ")
+_PFX_RISK_OK = sys.intern("✅ 风险检查通过")
+_PFX_RISK_FAIL = sys.intern("⚠️  风险检查失败: ")
+_PFX_MARKET = sys.intern("📊 市场数据 ")
+_PFX_WS = sys.intern("🔌 WebSocket: ")
+_PFX_SYSTEM = sys.intern("🔧 系统: ")
+
+# log_api_request 的格式串（下标: 带参数=1，带请求体=2）
+_API_REQUEST_FMT = (
+    _PFX_API_REQ + "%s %s",
+    _PFX_API_REQ + "%s %s\n   参数: %s",
+    _PFX_API_REQ + "%s %s\n   请求体: %s",
+    _PFX_API_REQ + "%s %s\n   参数: %s\n   请求体: %s",
+)
+_API_RESPONSE_FMT = _PFX_API_RSP + "%s %s - Status: %s\n   数据: %s"
+
+# API 响应数据在日志中保留的最大字符数（行情类响应可能有数 KB）
+API_RESPONSE_MAX_CHARS = 2048
+
+# log_order 逐字段格式（inst_id, side, px, sz, ord_id）
+_ORDER_FIELDS_FMT = "%s %s px=%s sz=%s id=%s"
+
+_SIGNAL_FMT = _PFX_SIGNAL + "[%s] %s %s side=%s price=%s size=%s | %s"
+_MARKET_FMT = _PFX_MARKET + "[%s] (%s): %s"
+_RISK_FAIL_FMT = _PFX_RISK_FAIL + "%s"
+_WS_FMT = _PFX_WS + "%s %s"
+_SYSTEM_FMT = _PFX_SYSTEM + "%s - %s"
+
+
+# 查找调用方时跳过的文件（logging 自身与本模块的包装方法）
+_SKIP_FILES = frozenset((
+    os.path.normcase(logging.__file__),
+    os.path.normcase(__file__),
+))
+
+
+def _make_find_caller(logger: logging.Logger):
+    """
+    生成替换 Logger.findCaller 的函数
+    
+    直接沿 sys._getframe 向上找第一个不在 logging / 本模块内的栈帧，
+    不做逐帧路径规范化，并跳过 QuantLogger 包装层（记录真正的调用位置）
+    """
+    default_find_caller = logger.findCaller
+    skip_files = _SKIP_FILES
+    
+    def find_caller(stack_info=False, stacklevel=1):
+        if stack_info:
+            return default_find_caller(stack_info, stacklevel)
+        
+        frame = sys._getframe(1)
+        while frame is not None and frame.f_code.co_filename in skip_files:
+            frame = frame.f_back
+        
+        while frame is not None and stacklevel > 1:
+            frame = frame.f_back
+            stacklevel -= 1
+        
+        if frame is None:
+            return "(unknown file)", 0, "(unknown function)", None
+        
+        code = frame.f_code
+        return code.co_filename, frame.f_lineno, code.co_name, None
+    
+    return find_caller
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """
+    缓存时间字符串的格式化器
+    
+    datefmt 精度为秒，同一秒、同一 datefmt 的记录复用上一次 strftime 的结果
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._time_cache = (None, None, "")  # (秒, datefmt, 格式化结果)，整体替换以保证线程间一致
+    
+    def formatTime(self, record, datefmt=None):
+        """格式化记录时间（按秒缓存）"""
+        datefmt = datefmt or self.datefmt
+        if not datefmt:
+            return super().formatTime(record, datefmt)
+        
+        sec = int(record.created)
+        cached_sec, cached_fmt, cached_str = self._time_cache
+        if sec == cached_sec and datefmt == cached_fmt:
+            return cached_str
+        
+        formatted = time.strftime(datefmt, self.converter(sec))
+        self._time_cache = (sec, datefmt, formatted)
+        return formatted
+
+
+class FixedLayoutFormatter(CachedTimeFormatter):
+    """
+    固定版式的格式化器
+    
+    版式在构造时确定，format() 直接拼接已知字段，
+    不再每条记录经过 PercentStyle 的模板替换；
+    多个格式化器可共用同一个时间缓存（time_source）
+    """
+    
+    def __init__(
+        self,
+        datefmt: str,
+        with_source: bool = False,
+        time_source: Optional[CachedTimeFormatter] = None
+    ):
+        """
+        初始化格式化器
+        
+        Args:
+            datefmt: 时间格式
+            with_source: 是否包含 [文件名:行号]
+            time_source: 提供时间字符串的格式化器（默认使用自身的缓存）
+        """
+        if with_source:
+            fmt = '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
+        else:
+            fmt = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        super().__init__(fmt, datefmt=datefmt)
+        self.with_source = with_source
+        self._format_time = (time_source or self).formatTime
+    
+    def format(self, record) -> str:
+        """格式化记录（异常与调用栈文本的追加方式与 logging.Formatter 一致）"""
+        record.message = message = record.getMessage()
+        if self.with_source:
+            s = (f"{self._format_time(record)} - {record.name} - {record.levelname} - "
+                 f"[{record.filename}:{record.lineno}] - {message}")
+        else:
+            s = f"{self._format_time(record)} - {record.name} - {record.levelname} - {message}"
+        
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            s = s + "\n" + record.exc_text
+        if record.stack_info:
+            s = s + "\n" + self.formatStack(record.stack_info)
+        return s
+
+
+class FastRotatingFileHandler(RotatingFileHandler):
+    """
+    按大小轮转的文件处理器（自行累计写入字节数）
+    
+    只有本进程写日志文件，因此用计数器代替每条记录的 stream.tell()；
+    文件以二进制方式打开，记录只编码一次后直接写入缓冲区（不经过 TextIOWrapper）；
+    WARNING 及以上立即刷盘，其余由后台线程定时刷盘
+    """
+    
+    def __init__(
+        self,
+        filename,
+        *args,
+        buffer_size: int = 64 * 1024,
+        flush_level: int = logging.WARNING,
+        flush_interval: float = 0.2,
+        **kwargs
+    ):
+        """
+        初始化处理器
+        
+        Args:
+            filename: 日志文件
+            buffer_size: 写缓冲大小（字节）
+            flush_level: 达到该级别的记录立即刷盘
+            flush_interval: 定时刷盘间隔（秒）
+        """
+        self.buffer_size = buffer_size
+        self.flush_level = flush_level
+        super().__init__(filename, *args, **kwargs)
+        
+        # 追加写入时从现有文件大小开始计数
+        try:
+            self._bytes_written = os.path.getsize(self.baseFilename)
+        except OSError:
+            self._bytes_written = 0
+        
+        # 定时刷盘线程
+        self.flush_interval = flush_interval
+        self._stop_flush = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="log-flusher", daemon=True)
+        self._flusher.start()
+    
+    def _open(self):
+        """以二进制、大缓冲区打开日志文件"""
+        return open(self.baseFilename, self.mode + "b", buffering=self.buffer_size)
+    
+    def _flush_loop(self):
+        """定时刷盘"""
+        while not self._stop_flush.wait(self.flush_interval):
+            self.flush()
+    
+    def close(self):
+        """停止刷盘线程并关闭文件"""
+        self._stop_flush.set()
+        super().close()
+    
+    def shouldRollover(self, record) -> bool:
+        """是否已达到轮转大小"""
+        return self.maxBytes > 0 and self._bytes_written >= self.maxBytes
+    
+    def emit(self, record):
+        """写入一条记录（写入前按累计大小判断是否轮转）"""
+        try:
+            data = (self.format(record) + self.terminator).encode(
+                self.encoding or "utf-8", self.errors or "strict"
+            )
+            size = len(data)
+            
+            if self.maxBytes > 0 and self._bytes_written and self._bytes_written + size >= self.maxBytes:
+                self.doRollover()
+            
+            if self.stream is None:
+                self.stream = self._open()
+            
+            self.stream.write(data)
+            self._bytes_written += size
+            
+            if record.levelno >= self.flush_level:
+                self.flush()
+        
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def doRollover(self):
+        """轮转并重置计数"""
+        super().doRollover()
+        self._bytes_written = 0
 
 
 class QuantLogger:
     """量化交易专用日志记录器"""
     
     _instance = None
+    _initialized = False
     
     def __new__(cls):
         if cls._instance is None:
@@ -21,11 +282,11 @@ class QuantLogger:
         return cls._instance
     
     def __init__(self):
-        """初始化日志系统"""
-        if hasattr(self, '_initialized'):
+        """初始化日志系统（单例，只配置一次）"""
+        if QuantLogger._initialized:
             return
-            
-        self._initialized = True
+        
+        QuantLogger._initialized = True
         self._setup_logger()
     
     def _setup_logger(self):
@@ -40,7 +301,29 @@ class QuantLogger:
         
         # 创建 logger
         self.logger = logging.getLogger("OKX_Quant")
-        self.logger.setLevel(getattr(logging, log_level.upper()))
+        self.logger.findCaller = _make_find_caller(self.logger)
+        self.logger.setLevel(_LEVELS.get(log_level.upper(), logging.INFO))
+        
+        # 绑定一次底层 Logger 方法（辅助方法直接调用）
+        self._debug = self.logger.debug
+        self._info = self.logger.info
+        self._warning = self.logger.warning
+        self._error = self.logger.error
+        
+        # 订单操作 -> (日志方法, 整体格式, 逐字段格式)
+        self._order_table = {
+            "place": (self._info, _PFX_PLACE + "%s", _PFX_PLACE + _ORDER_FIELDS_FMT),
+            "cancel": (self._warning, _PFX_CANCEL + "%s", _PFX_CANCEL + _ORDER_FIELDS_FMT),
+            "filled": (self._info, _PFX_FILLED + "%s", _PFX_FILLED + _ORDER_FIELDS_FMT),
+            "failed": (self._error, _PFX_FAILED + "%s", _PFX_FAILED + _ORDER_FIELDS_FMT),
+        }
+        
+        # 盈亏 (日志方法, 格式)，按 sign + 1 取用（亏损 / 持平 / 盈利）；持平不记录
+        self._pnl_table = (
+            (self._warning, _PFX_LOSS + "%s (%s)"),
+            None,
+            (self._info, _PFX_PROFIT + "+%s (%s)"),
+        )
         
         # 避免重复添加 handler
         if self.logger.handlers:
@@ -49,39 +332,37 @@ class QuantLogger:
         # 控制台处理器
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
-        console_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+        console_formatter = FixedLayoutFormatter(datefmt='%Y-%m-%d %H:%M:%S')
         console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
         
         # 文件处理器（按大小轮转）
-        file_handler = RotatingFileHandler(
+        file_handler = FastRotatingFileHandler(
             log_file,
-            maxBytes=10*1024*1024,  # 10MB
-            backupCount=5,
+            maxBytes=50*1024*1024,  # 50MB
+            backupCount=10,
             encoding='utf-8'
         )
         file_handler.setLevel(logging.DEBUG)
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
+        file_formatter = FixedLayoutFormatter(
+            datefmt='%Y-%m-%d %H:%M:%S',
+            with_source=True,
+            time_source=console_formatter  # 与控制台共用时间缓存，每秒只 strftime 一次
         )
         file_handler.setFormatter(file_formatter)
-        self.logger.addHandler(file_handler)
         
-        # 每天的日志文件
-        daily_log_file = log_dir / f"okx_quant_{datetime.now().strftime('%Y%m%d')}.log"
-        daily_handler = RotatingFileHandler(
-            daily_log_file,
-            maxBytes=50*1024*1024,  # 50MB
-            backupCount=3,
-            encoding='utf-8'
+        # 调用方只入队，控制台/文件写入由后台监听线程完成
+        self._log_queue = queue.SimpleQueue()
+        self.logger.addHandler(QueueHandler(self._log_queue))
+        self._listener = QueueListener(
+            self._log_queue,
+            console_handler,
+            file_handler,
+            respect_handler_level=True
         )
-        daily_handler.setLevel(logging.DEBUG)
-        daily_handler.setFormatter(file_formatter)
-        self.logger.addHandler(daily_handler)
+        self._listener.start()
+        
+        # 退出时写完队列中剩余的日志
+        atexit.register(self._listener.stop)
         
         self.info("✓ 日志系统初始化完成")
     
@@ -105,66 +386,115 @@ class QuantLogger:
         """CRITICAL 级别日志"""
         self.logger.critical(msg, *args, **kwargs)
     
+    def exception(self, msg, *args, **kwargs):
+        """ERROR 级别日志（附带当前异常堆栈）"""
+        self.logger.exception(msg, *args, **kwargs)
+    
     # ========== 特殊场景日志 ==========
     
+    # 参数以 %s 形式交给 logging，只有记录真正被处理时才格式化；
+    # DEBUG 级别的辅助方法在关闭时直接返回
+    
     def log_api_request(self, method, endpoint, params=None, body=None):
         """记录 API 请求"""
-        self.debug(f"📤 API 请求: {method} {endpoint}")
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        
+        # 一条记录（多行），格式串按是否带参数/请求体预先拼好
         if params:
-            self.debug(f"   参数: {params}")
-        if body:
-            self.debug(f"   请求体: {body}")
+            if body:
+                self._debug(_API_REQUEST_FMT[3], method, endpoint, params, body)
+            else:
+                self._debug(_API_REQUEST_FMT[1], method, endpoint, params)
+        elif body:
+            self._debug(_API_REQUEST_FMT[2], method, endpoint, body)
+        else:
+            self._debug(_API_REQUEST_FMT[0], method, endpoint)
     
     def log_api_response(self, method, endpoint, status_code, data):
-        """记录 API 响应"""
-        self.debug(f"📥 API 响应: {method} {endpoint} - Status: {status_code}")
-        self.debug(f"   数据: {data}")
-    
-    def log_order(self, action, order_info):
-        """记录订单操作"""
-        if action == "place":
-            self.info(f"📌 下单: {order_info}")
-        elif action == "cancel":
-            self.warning(f"❌ 撤单: {order_info}")
-        elif action == "filled":
-            self.info(f"✅ 成交: {order_info}")
-        elif action == "failed":
-            self.error(f"⛔ 订单失败: {order_info}")
+        """记录 API 响应（超长数据截断）"""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        
+        text = str(data)
+        if len(text) > API_RESPONSE_MAX_CHARS:
+            text = f"{text[:API_RESPONSE_MAX_CHARS]}...<+{len(text) - API_RESPONSE_MAX_CHARS} chars>"
+        
+        self._debug(_API_RESPONSE_FMT, method, endpoint, status_code, text)
+    
+    def log_order(self, action, order=None, *, inst_id=None, side=None, px=None, sz=None, ord_id=None):
+        """
+        记录订单操作（未知操作忽略）
+        
+        传入订单信息（如订单字典）时整体输出，否则按关键字字段输出；
+        字段不转字符串，只有日志真正输出时才格式化
+        
+        Args:
+            action: place / cancel / filled / failed
+            order: 订单信息
+            inst_id: 产品 ID
+            side: 方向
+            px: 价格
+            sz: 数量
+            ord_id: 订单 ID
+        """
+        entry = self._order_table.get(action)
+        if entry is None:
+            return
+        
+        log, fmt, fields_fmt = entry
+        if order is not None:
+            log(fmt, order)
+        else:
+            log(fields_fmt, inst_id, side, px, sz, ord_id)
     
     def log_strategy_signal(self, signal):
-        """记录策略信号"""
-        self.info(f"🎯 策略信号: {signal}")
+        """记录策略信号（按属性读取 Signal 字段）"""
+        self._info(
+            _SIGNAL_FMT,
+            signal.strategy, getattr(signal.kind, "name", signal.kind), signal.inst_id,
+            signal.side, signal.price, signal.size, signal.reason
+        )
     
     def log_risk_check(self, passed, reason=""):
         """记录风险检查"""
         if passed:
-            self.info(f"✅ 风险检查通过")
+            self._info(_PFX_RISK_OK)
         else:
-            self.warning(f"⚠️  风险检查失败: {reason}")
+            self._warning(_RISK_FAIL_FMT, reason)
     
     def log_market_data(self, inst_id, data_type, data):
         """记录市场数据"""
-        self.debug(f"📊 市场数据 [{inst_id}] ({data_type}): {data}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._debug(_MARKET_FMT, inst_id, data_type, data)
     
     def log_websocket(self, event, detail=""):
         """记录 WebSocket 事件"""
-        self.info(f"🔌 WebSocket: {event} {detail}")
+        self._info(_WS_FMT, event, detail)
     
     def log_pnl(self, action, amount, reason=""):
-        """记录盈亏"""
-        if amount > 0:
-            self.info(f"💰 盈利: +{amount} ({reason})")
-        elif amount < 0:
-            self.warning(f"📉 亏损: {amount} ({reason})")
+        """记录盈亏（盈亏为 0 时不记录）"""
+        entry = self._pnl_table[(amount > 0) - (amount < 0) + 1]
+        if entry is not None:
+            log, fmt = entry
+            log(fmt, amount, reason)
     
     def log_system(self, event, detail=""):
         """记录系统事件"""
-        self.info(f"🔧 系统: {event} - {detail}")
+        self._info(_SYSTEM_FMT, event, detail)
 
 
 # 全局日志实例
 logger = QuantLogger()
 
+# 模块级快捷方法（直接绑定到底层 Logger，热路径可 from utils.logger import info）
+debug = logger.logger.debug
+info = logger.logger.info
+warning = logger.logger.warning
+error = logger.logger.error
+critical = logger.logger.critical
+exception = logger.logger.exception
+
 
 # 便捷函数
 def get_logger():
@@ -173,6 +503,10 @@ def get_logger():
 
 
 if __name__ == "__main__":
+    # 直接运行本文件时加入项目根目录，以便导入 Signal
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from strategies.base_strategy import SIDE_BUY, Signal, SignalKind
+    
     # 测试日志
     logger.info("测试开始")
     logger.debug("调试信息")
@@ -180,6 +514,14 @@ if __name__ == "__main__":
     logger.error("错误信息")
     logger.log_api_request("POST", "/api/v5/trade/order", {"instId": "BTC-USDT"})
     logger.log_order("place", {"side": "buy", "px": "30000", "sz": "0.1"})
-    logger.log_strategy_signal({"type": "BUY", "price": 30000})
+    logger.log_strategy_signal(Signal(
+        kind=SignalKind.FRONT_RUNNING,
+        inst_id="BTC-USDT",
+        side=SIDE_BUY,
+        price=30000.0,
+        size=0.1,
+        reason="测试信号",
+        strategy="测试策略"
+    ))
     logger.log_risk_check(True)
-    logger.log_pnl(100.5, "BTC-USDT")
+    logger.log_pnl("close", 100.5, "BTC-USDT")